@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import time
 import uuid
-from collections import defaultdict
+from collections import OrderedDict
 from typing import Any
 
 from fastapi import FastAPI, Request, Response
@@ -19,22 +20,95 @@ logger = logging.getLogger(__name__)
 
 # ── In-memory rate limit store (per-process; swap for Redis in prod) ───
 
-_rate_buckets: dict[str, list[float]] = defaultdict(list)
+# key → (window index, previous window's count, current window's count),
+# kept in least-recently-used order so stale keys collect at the front
+_rate_buckets: OrderedDict[str, tuple[int, int, int]] = OrderedDict()
+
+# Token digest or "anon:<ip>" → (blocked-until timestamp, limit), so repeat
+# requests from a throttled client skip the token decode and counters
+_over_limit_until: OrderedDict[bytes | str, tuple[float, int]] = OrderedDict()
+
+# blake2b(token) → (exp, payload) for verified tokens, in LRU order
+_token_cache: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
 
 RATE_LIMIT_WINDOW = 60  # seconds
+RATE_LIMIT_MAX_KEYS = 10_000
+TOKEN_CACHE_SIZE = 4096
 
 
 def _check_rate_limit(key: str, limit: int) -> tuple[bool, int]:
-    """Return (allowed, remaining) for a given key and per-minute limit."""
+    """Return (allowed, remaining) for a given key and per-minute limit.
+
+    Sliding-window counter: the previous fixed window's count is weighted by
+    how much of it still overlaps the last RATE_LIMIT_WINDOW seconds, so each
+    key costs two counters instead of a timestamp per request.
+    """
     now = time.time()
-    window_start = now - RATE_LIMIT_WINDOW
-    bucket = _rate_buckets[key]
-    # Prune old entries
-    _rate_buckets[key] = bucket = [t for t in bucket if t > window_start]
-    if len(bucket) >= limit:
+    window, elapsed = divmod(now, RATE_LIMIT_WINDOW)
+    window = int(window)
+    last_window, prev, curr = _rate_buckets.get(key, (window, 0, 0))
+    if last_window != window:
+        prev = curr if last_window == window - 1 else 0
+        curr = 0
+    estimate = prev * (1 - elapsed / RATE_LIMIT_WINDOW) + curr
+    allowed = estimate < limit
+    _rate_buckets[key] = (window, prev, curr + 1 if allowed else curr)
+    _rate_buckets.move_to_end(key)
+    _prune_rate_buckets(window)
+    if not allowed:
         return False, 0
-    bucket.append(now)
-    return True, limit - len(bucket)
+    return True, max(0, int(limit - estimate - 1))
+
+
+def _prune_rate_buckets(window: int) -> None:
+    """Drop keys idle for two windows, then the least recent past the size cap.
+
+    Keys sit in last-access order, so only the expired front entries are
+    touched rather than the whole map.
+    """
+    while _rate_buckets:
+        oldest_key, (last_window, _, _) = next(iter(_rate_buckets.items()))
+        if last_window >= window - 1 and len(_rate_buckets) <= RATE_LIMIT_MAX_KEYS:
+            break
+        del _rate_buckets[oldest_key]
+
+
+def _blocked_until(key: str, limit: int) -> float:
+    """Earliest time a just-rejected key's estimate can drop below ``limit``."""
+    window, prev, curr = _rate_buckets[key]
+    window_end = (window + 1) * RATE_LIMIT_WINDOW
+    if curr >= limit or prev == 0:
+        return window_end
+    return window_end - RATE_LIMIT_WINDOW * (limit - curr) / prev
+
+
+def _token_digest(token: str) -> bytes:
+    """Key a bearer token in the in-memory caches without keeping the token."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _decode_token_cached(token: str, digest: bytes, now: float) -> dict[str, Any] | None:
+    """Decode a bearer token, reusing the payload until the token's ``exp``.
+
+    ``digest`` is the token's ``_token_digest``. Only successfully verified
+    tokens that carry an ``exp`` are cached.
+    """
+    from fittrack.core.security import decode_token_safe
+
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        if cached[0] > now:
+            _token_cache.move_to_end(digest)
+            return cached[1]
+        del _token_cache[digest]
+
+    payload = decode_token_safe(token)
+    exp = payload.get("exp") if payload else None
+    if isinstance(exp, int | float) and exp > now:
+        _token_cache[digest] = (exp, payload)
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
 
 
 def _get_client_key(request: Request) -> str:
@@ -164,13 +238,23 @@ def _apply_rate_limit(request: Request, settings: Any) -> JSONResponse | None:
     # Determine tier
     auth_header = request.headers.get("authorization", "")
     client_key = _get_client_key(request)
-
+    token = ""
+    digest: bytes | None = None
     if auth_header.startswith("Bearer "):
-        # Authenticated request — check for admin role via JWT
-        from fittrack.core.security import decode_token_safe
-
         token = auth_header.split(" ", 1)[1]
-        payload = decode_token_safe(token)
+        digest = _token_digest(token)
+    block_key = digest or f"anon:{client_key}"
+
+    now = time.time()
+    blocked = _over_limit_until.get(block_key)
+    if blocked is not None:
+        if blocked[0] > now:
+            return _rate_limited_response(blocked[1])
+        del _over_limit_until[block_key]
+
+    if digest is not None:
+        # Authenticated request — check for admin role via JWT
+        payload = _decode_token_cached(token, digest, now)
         if payload and payload.get("role") == "admin":
             limit = getattr(settings, "rate_limit_admin", 500)
             rate_key = f"admin:{payload.get('sub', client_key)}"
@@ -184,23 +268,31 @@ def _apply_rate_limit(request: Request, settings: Any) -> JSONResponse | None:
 
     allowed, remaining = _check_rate_limit(rate_key, limit)
     if not allowed:
-        return JSONResponse(
-            status_code=429,
-            content={
-                "type": "about:blank",
-                "title": "Too Many Requests",
-                "status": 429,
-                "detail": f"Rate limit exceeded. Max {limit} requests per minute.",
-            },
-            headers={
-                "Retry-After": str(RATE_LIMIT_WINDOW),
-                "X-RateLimit-Limit": str(limit),
-                "X-RateLimit-Remaining": "0",
-            },
-        )
+        _over_limit_until[block_key] = (_blocked_until(rate_key, limit), limit)
+        if len(_over_limit_until) > RATE_LIMIT_MAX_KEYS:
+            _over_limit_until.popitem(last=False)
+        return _rate_limited_response(limit)
     return None
 
 
+def _rate_limited_response(limit: int) -> JSONResponse:
+    """Build the 429 Problem Details response for a per-minute ``limit``."""
+    return JSONResponse(
+        status_code=429,
+        content={
+            "type": "about:blank",
+            "title": "Too Many Requests",
+            "status": 429,
+            "detail": f"Rate limit exceeded. Max {limit} requests per minute.",
+        },
+        headers={
+            "Retry-After": str(RATE_LIMIT_WINDOW),
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": "0",
+        },
+    )
+
+
 def rfc7807_error_response(
     status: int,
     title: str,
@@ -5,14 +5,18 @@ from __future__ import annotations
 import time
 from typing import Any
 
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import ORJSONResponse
 
 router = APIRouter()
 
+# Static liveness body, encoded once. A fresh Response is still built per
+# request because middleware mutates response headers in place.
+_LIVE_BODY = b'{"status":"alive"}'
+
 
 @router.get("/health")
-def health_check(request: Request) -> dict[str, Any]:
+def health_check(request: Request) -> Response:
     """Application health check endpoint."""
     settings = getattr(request.app.state, "settings", None)
     env = settings.app_env if settings else "unknown"
@@ -20,25 +24,27 @@ def health_check(request: Request) -> dict[str, Any]:
     db_pool = getattr(request.app.state, "db_pool", None)
     db_status = "connected" if db_pool is not None else "disconnected"
 
-    return {
-        "status": "ok",
-        "environment": env,
-        "database": db_status,
-    }
+    return ORJSONResponse(
+        {
+            "status": "ok",
+            "environment": env,
+            "database": db_status,
+        }
+    )
 
 
 @router.get("/health/live")
-def liveness_probe() -> dict[str, Any]:
+def liveness_probe() -> Response:
     """Liveness probe — is the process alive and responding?
 
     Returns 200 if the application can handle requests.
     Kubernetes uses this to decide whether to restart the container.
     """
-    return {"status": "alive"}
+    return Response(content=_LIVE_BODY, media_type="application/json")
 
 
 @router.get("/health/ready")
-def readiness_probe(request: Request) -> dict[str, Any]:
+def readiness_probe(request: Request) -> Response:
     """Readiness probe — is the application ready to serve traffic?
 
     Checks database connectivity and critical dependencies.
@@ -78,6 +84,4 @@ def readiness_probe(request: Request) -> dict[str, Any]:
         "status": "ready" if overall_ready else "not_ready",
         "checks": checks,
     }
-    if not overall_ready:
-        return JSONResponse(content=body, status_code=503)  # type: ignore[return-value]
-    return body
+    return ORJSONResponse(content=body, status_code=200 if overall_ready else 503)
@@ -8,6 +8,7 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from fittrack.api.middleware import setup_middleware
@@ -41,6 +42,10 @@ def create_app(settings: Settings | None = None) -> FastAPI:
                     "Use /api/v1/dev/migrate once Oracle is ready."
                 )
                 app.state.db_pool = None
+        # Routes are fixed once the app is built; generate the OpenAPI schema
+        # now (FastAPI memoizes it on app.openapi_schema) so the first
+        # /openapi.json request doesn't pay for the full route walk.
+        app.openapi()
         yield
         logger.info("Shutting down FitTrack API")
         if not settings.is_testing:
@@ -53,6 +58,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Store settings on app state
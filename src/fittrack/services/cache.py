@@ -6,12 +6,27 @@ Falls back to an in-memory dict when Redis is unavailable (dev/test).
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# SCAN page-size hint and max keys per DEL in delete_pattern
+_SCAN_COUNT = 1000
+_DELETE_BATCH = 500
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize for Redis; types orjson can't encode (e.g. Decimal) go through str."""
+    return orjson.dumps(value, default=str)
+
+
+def leaderboard_key(period: str, tier_code: str | None) -> str:
+    """Cache key for a period/tier leaderboard (``None`` tier = global)."""
+    return f"leaderboard:{period}:{tier_code or 'global'}"
+
 
 class CacheService:
     """Unified caching interface backed by Redis or in-memory fallback.
@@ -37,7 +52,7 @@ class CacheService:
                 raw = self._redis.get(key)
                 if raw is None:
                     return None
-                return json.loads(raw)
+                return orjson.loads(raw)
             except Exception:
                 logger.warning("Cache GET failed for %s", key, exc_info=True)
                 return None
@@ -47,8 +62,7 @@ class CacheService:
         """Set a value with TTL (seconds). Default 15 minutes."""
         if self._redis is not None:
             try:
-                serialized = json.dumps(value, default=str)
-                self._redis.setex(key, ttl, serialized)
+                self._redis.setex(key, ttl, _dumps(value))
                 return True
             except Exception:
                 logger.warning("Cache SET failed for %s", key, exc_info=True)
@@ -56,6 +70,21 @@ class CacheService:
         self._memory[key] = value
         return True
 
+    def set_many(self, mapping: dict[str, Any], ttl: int = 900) -> bool:
+        """Set several values with the same TTL in one round trip."""
+        if self._redis is not None:
+            try:
+                with self._redis.pipeline(transaction=False) as pipe:
+                    for key, value in mapping.items():
+                        pipe.setex(key, ttl, _dumps(value))
+                    pipe.execute()
+                return True
+            except Exception:
+                logger.warning("Cache SET_MANY failed for %d keys", len(mapping), exc_info=True)
+                return False
+        self._memory.update(mapping)
+        return True
+
     def delete(self, key: str) -> bool:
         """Delete a key. Returns True if the key existed."""
         if self._redis is not None:
@@ -78,10 +107,15 @@ class CacheService:
             try:
                 count = 0
                 cursor = 0
+                batch: list[Any] = []
                 while True:
-                    cursor, keys = self._redis.scan(cursor=cursor, match=pattern, count=100)
-                    if keys:
-                        count += self._redis.delete(*keys)
+                    cursor, keys = self._redis.scan(cursor=cursor, match=pattern, count=_SCAN_COUNT)
+                    batch.extend(keys)
+                    # Sparse matches trickle in a few per page; buffer them so
+                    # each DEL round trip carries up to _DELETE_BATCH keys.
+                    while len(batch) >= _DELETE_BATCH or (cursor == 0 and batch):
+                        count += self._redis.delete(*batch[:_DELETE_BATCH])
+                        del batch[:_DELETE_BATCH]
                     if cursor == 0:
                         break
                 return count
@@ -89,10 +123,15 @@ class CacheService:
                 logger.warning("Cache DELETE_PATTERN failed for %s", pattern, exc_info=True)
                 return 0
 
-        # In-memory: simple glob-like matching (only supports trailing *)
-        import fnmatch
+        # In-memory: plain "prefix*" patterns (all current callers) use a
+        # startswith check; anything else falls back to full glob matching.
+        prefix = pattern[:-1]
+        if pattern.endswith("*") and not any(c in prefix for c in "*?["):
+            to_delete = [k for k in self._memory if k.startswith(prefix)]
+        else:
+            import fnmatch
 
-        to_delete = [k for k in self._memory if fnmatch.fnmatch(k, pattern)]
+            to_delete = [k for k in self._memory if fnmatch.fnmatch(k, pattern)]
         for k in to_delete:
             del self._memory[k]
         return len(to_delete)
@@ -124,8 +163,7 @@ class CacheService:
         tier_code: str | None = None,
     ) -> list[dict[str, Any]] | None:
         """Shortcut to retrieve cached leaderboard rankings."""
-        key = f"leaderboard:{period}:{tier_code or 'global'}"
-        return self.get(key)
+        return self.get(leaderboard_key(period, tier_code))
 
     def set_leaderboard(
         self,
@@ -135,8 +173,7 @@ class CacheService:
         ttl: int = 900,
     ) -> bool:
         """Shortcut to cache leaderboard rankings."""
-        key = f"leaderboard:{period}:{tier_code or 'global'}"
-        return self.set(key, rankings, ttl=ttl)
+        return self.set(leaderboard_key(period, tier_code), rankings, ttl=ttl)
 
     def invalidate_leaderboards(self) -> int:
         """Invalidate all leaderboard cache entries."""
@@ -13,10 +13,16 @@ All period boundaries use US Eastern (EST/EDT).
 from __future__ import annotations
 
 import logging
+import sys
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
 from typing import Any
 from zoneinfo import ZoneInfo
 
+from fittrack.core.constants import ALL_TIER_CODES
+from fittrack.services.cache import leaderboard_key
+
 logger = logging.getLogger(__name__)
 
 # US Eastern for period boundaries
@@ -27,6 +33,19 @@ LEADERBOARD_TOP_N = 100
 LEADERBOARD_CONTEXT_WINDOW = 10  # ±10 positions around user
 VALID_PERIODS = ("daily", "weekly", "monthly", "all_time")
 
+# Every period/tier cache key, built and interned once at import
+_LB_KEYS: dict[tuple[str, str | None], str] = {
+    (period, tier): sys.intern(leaderboard_key(period, tier))
+    for period in VALID_PERIODS
+    for tier in (*ALL_TIER_CODES, None)
+}
+
+
+def _cache_key(period: str, tier_code: str | None) -> str:
+    """Interned leaderboard key; unknown tier codes are formatted on demand."""
+    key = _LB_KEYS.get((period, tier_code))
+    return key if key is not None else leaderboard_key(period, tier_code)
+
 
 class LeaderboardError(Exception):
     """Leaderboard service error with HTTP status hint."""
@@ -48,7 +67,13 @@ def get_period_start(period: str, now: datetime | None = None) -> datetime:
     """
     if now is None:
         now = datetime.now(tz=UTC)
+    # Boundaries fall on whole days, so truncating to the minute never moves
+    # the result and lets repeated calls within a minute hit the cache.
+    return _period_start(period, now.replace(second=0, microsecond=0))
+
 
+@lru_cache(maxsize=64)
+def _period_start(period: str, now: datetime) -> datetime:
     now_est = now.astimezone(EST)
 
     if period == "daily":
@@ -78,6 +103,47 @@ def get_period_end(period: str, now: datetime | None = None) -> datetime:
 
 # ── Ranking engine (pure function) ─────────────────────────────────
 
+# compute_rankings packs (points desc, earliest achievement asc, active days
+# desc) into one int so the sort compares a single integer per entry, with
+# user_id as the final tie-break. Python ints are unbounded, so the packing is
+# exact as long as the lower fields fit their bit widths.
+_EA_BITS = 64
+_DAYS_BITS = 16
+_DAYS_MAX = (1 << _DAYS_BITS) - 1
+_MIN_UTC = datetime.min.replace(tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+# Missing/unparseable achievements sort after every real timestamp
+_EA_NONE = (datetime.max.replace(tzinfo=UTC) - _MIN_UTC) // _ONE_MICROSECOND
+
+
+@lru_cache(maxsize=4096)
+def _iso_achievement_micros(ea: str) -> int:
+    """Parse an ISO timestamp once; a cohort's entries often share one."""
+    try:
+        return _achievement_micros(datetime.fromisoformat(ea))
+    except ValueError:
+        return _EA_NONE
+
+
+def _achievement_micros(ea: datetime | str | None) -> int:
+    """Microseconds since ``datetime.min`` UTC; ``None``/invalid sorts last."""
+    if ea is None:
+        return _EA_NONE
+    if isinstance(ea, str):
+        return _iso_achievement_micros(ea)
+    if ea.tzinfo is None:
+        ea = ea.replace(tzinfo=UTC)
+    return max((ea - _MIN_UTC) // _ONE_MICROSECOND, 0)
+
+
+def _rank_key(entry: dict[str, Any]) -> int:
+    """Pack points (desc), earliest achievement (asc), active days (desc)."""
+    pts = int(entry.get("points_earned", 0) or 0)
+    ea = _achievement_micros(entry.get("earliest_achievement"))
+    # Clamp so the field stays within its bits (a period never spans 65k days)
+    active = min(max(int(entry.get("active_days", 0) or 0), 0), _DAYS_MAX)
+    return (-pts << (_EA_BITS + _DAYS_BITS)) + (ea << _DAYS_BITS) + (_DAYS_MAX - active)
+
 
 def compute_rankings(
     entries: list[dict[str, Any]],
@@ -94,33 +160,9 @@ def compute_rankings(
 
     Returns a list with ``rank`` added to each entry, sorted 1..N.
     """
-
-    def sort_key(entry: dict[str, Any]) -> tuple[int, Any, int, str]:
-        pts = -(entry.get("points_earned", 0) or 0)
-
-        # Tie-break 1: earliest achievement of the total
-        ea = entry.get("earliest_achievement")
-        if ea is None:
-            ea_val = datetime.max.replace(tzinfo=UTC)
-        elif isinstance(ea, str):
-            try:
-                ea_val = datetime.fromisoformat(ea)
-            except ValueError:
-                ea_val = datetime.max.replace(tzinfo=UTC)
-        else:
-            ea_val = ea
-        if ea_val.tzinfo is None:
-            ea_val = ea_val.replace(tzinfo=UTC)
-
-        # Tie-break 2: more active days (descending → negate)
-        active = -(entry.get("active_days", 0) or 0)
-
-        # Tie-break 3: user_id (ascending, deterministic)
-        uid = entry.get("user_id", "")
-
-        return (pts, ea_val, active, uid)
-
-    sorted_entries = sorted(entries, key=sort_key)
+    decorated = [(_rank_key(entry), entry.get("user_id", ""), entry) for entry in entries]
+    decorated.sort(key=itemgetter(0, 1))
+    sorted_entries = [entry for _, _, entry in decorated]
 
     ranked: list[dict[str, Any]] = []
     for i, entry in enumerate(sorted_entries, start=1):
@@ -211,7 +253,7 @@ class LeaderboardService:
         if period not in VALID_PERIODS:
             raise LeaderboardError(f"Invalid period: {period}")
 
-        cache_key = f"leaderboard:{period}:{tier_code or 'global'}"
+        cache_key = _cache_key(period, tier_code)
 
         # Try cache
         if self.cache is not None:
@@ -238,7 +280,7 @@ class LeaderboardService:
         if period not in VALID_PERIODS:
             raise LeaderboardError(f"Invalid period: {period}")
 
-        cache_key = f"leaderboard:{period}:{tier_code or 'global'}"
+        cache_key = _cache_key(period, tier_code)
 
         rankings = None
         if self.cache is not None:
@@ -268,8 +310,7 @@ class LeaderboardService:
             return 0
 
         if period and tier_code:
-            key = f"leaderboard:{period}:{tier_code}"
-            return 1 if self.cache.delete(key) else 0
+            return 1 if self.cache.delete(_cache_key(period, tier_code)) else 0
 
         # Invalidate all leaderboard keys
         return int(self.cache.delete_pattern("leaderboard:*"))
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 from fittrack.services.providers.base import RawActivity
@@ -69,22 +71,24 @@ def detect_duplicate(
 
     Returns the activity_id of the duplicate, or None.
     """
+    external_id = raw.external_id
+    activity_type = raw.activity_type
     for existing in existing_activities:
+        # Both rules only match the same user's activities
+        if existing.get("user_id") != user_id:
+            continue
+
         # Rule 1: same external_id
-        if existing.get("external_id") == raw.external_id and existing.get("user_id") == user_id:
+        if existing.get("external_id") == external_id:
             result: str = existing.get("activity_id", "unknown")
             return result
 
         # Rule 2: same type + overlapping time
-        if (
-            existing.get("activity_type") == raw.activity_type
-            and existing.get("user_id") == user_id
-            and _times_overlap(
-                raw.start_time,
-                raw.end_time,
-                existing.get("start_time"),
-                existing.get("end_time"),
-            )
+        if existing.get("activity_type") == activity_type and _times_overlap(
+            raw.start_time,
+            raw.end_time,
+            existing.get("start_time"),
+            existing.get("end_time"),
         ):
             result2: str = existing.get("activity_id", "unknown")
             return result2
@@ -92,6 +96,71 @@ def detect_duplicate(
     return None
 
 
+class DuplicateIndex:
+    """One user's stored activities, indexed for repeated duplicate checks.
+
+    Keeps the first row per external_id and the rows of each activity type
+    in insertion order, so ``find`` only scans the same-type rows ahead of
+    the external_id match instead of every row. ``find`` returns exactly
+    what ``detect_duplicate`` would for the rows added so far; ``add`` lets
+    a sync batch check later activities against ones it just stored.
+    """
+
+    def __init__(self, user_id: str, existing_activities: Iterable[dict[str, Any]] = ()) -> None:
+        self.user_id = user_id
+        self._rows: list[dict[str, Any]] = []
+        self._by_external_id: dict[Any, int] = {}
+        self._by_type: dict[Any, list[int]] = {}
+        for activity in existing_activities:
+            self.add(activity)
+
+    def add(self, activity: dict[str, Any]) -> None:
+        """Index a stored activity; other users' rows are ignored."""
+        if activity.get("user_id") != self.user_id:
+            return
+        idx = len(self._rows)
+        self._rows.append(activity)
+        self._by_external_id.setdefault(activity.get("external_id"), idx)
+        self._by_type.setdefault(activity.get("activity_type"), []).append(idx)
+
+    def find(self, raw: RawActivity) -> str | None:
+        """Return the activity_id ``raw`` duplicates, or None."""
+        match = self._by_external_id.get(raw.external_id)
+        for idx in self._by_type.get(raw.activity_type, ()):
+            # detect_duplicate stops at the external_id row without comparing times
+            if match is not None and idx >= match:
+                break
+            existing = self._rows[idx]
+            if _times_overlap(
+                raw.start_time,
+                raw.end_time,
+                existing.get("start_time"),
+                existing.get("end_time"),
+            ):
+                match = idx
+                break
+        if match is None:
+            return None
+        result: str = self._rows[match].get("activity_id", "unknown")
+        return result
+
+
+def detect_duplicates_many(
+    raws: list[RawActivity],
+    user_id: str,
+    existing_activities: list[dict[str, Any]],
+) -> list[str | None]:
+    """Run ``detect_duplicate`` for a whole batch against one set of rows."""
+    index = DuplicateIndex(user_id, existing_activities)
+    return [index.find(raw) for raw in raws]
+
+
+@lru_cache(maxsize=1024)
+def _parse_ts(value: str) -> datetime:
+    """Parse a stored ISO timestamp; a sync batch re-checks the same rows often."""
+    return datetime.fromisoformat(value)
+
+
 def _times_overlap(
     start1: datetime | None,
     end1: datetime | None,
@@ -108,9 +177,9 @@ def _times_overlap(
 
     # Parse strings if needed
     if isinstance(start2, str):
-        start2 = datetime.fromisoformat(start2)
+        start2 = _parse_ts(start2)
     if isinstance(end2, str):
-        end2 = datetime.fromisoformat(end2)
+        end2 = _parse_ts(end2)
 
     if end1 is None or end2 is None:
         return bool(start1 == start2)
@@ -7,6 +7,8 @@ import uuid
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import orjson
+
 from fittrack.core.constants import (
     ACTIVE_DAY_MIN_MINUTES,
     DAILY_POINT_CAP,
@@ -38,6 +40,13 @@ class PointsError(Exception):
 
 # ── Rate Table Calculators ──────────────────────────────────────────
 
+# Points per active minute by intensity; unknown intensities earn the light rate
+_INTENSITY_RATES: dict[str, int] = {
+    "light": POINTS_ACTIVE_MINUTE_LIGHT,
+    "moderate": POINTS_ACTIVE_MINUTE_MODERATE,
+    "vigorous": POINTS_ACTIVE_MINUTE_VIGOROUS,
+}
+
 
 def calculate_step_points(step_count: int) -> int:
     """Calculate points earned from steps.
@@ -47,7 +56,8 @@ def calculate_step_points(step_count: int) -> int:
     """
     if step_count <= 0:
         return 0
-    capped_steps = min(step_count, STEPS_DAILY_CAP)
+    # A conditional expression beats a min() call on this hot scalar path
+    capped_steps = step_count if step_count < STEPS_DAILY_CAP else STEPS_DAILY_CAP
     return (capped_steps // 1000) * POINTS_PER_1K_STEPS
 
 
@@ -68,14 +78,7 @@ def calculate_active_minute_points(
     """
     if minutes <= 0:
         return 0
-
-    rate_map = {
-        "light": POINTS_ACTIVE_MINUTE_LIGHT,
-        "moderate": POINTS_ACTIVE_MINUTE_MODERATE,
-        "vigorous": POINTS_ACTIVE_MINUTE_VIGOROUS,
-    }
-    rate = rate_map.get(intensity, POINTS_ACTIVE_MINUTE_LIGHT)
-    return minutes * rate
+    return minutes * _INTENSITY_RATES.get(intensity, POINTS_ACTIVE_MINUTE_LIGHT)
 
 
 def calculate_workout_bonus(
@@ -95,20 +98,25 @@ def calculate_workout_bonus(
     return POINTS_WORKOUT_BONUS
 
 
+_STREAK_MASK = (1 << WEEKLY_STREAK_DAYS) - 1
+
+
 def calculate_weekly_streak_bonus(
-    active_days: list[bool],
+    active_days: list[bool] | int,
 ) -> int:
     """250-point bonus for 7 consecutive active days.
 
     Args:
-        active_days: List of 7 booleans (oldest → newest). An "active day"
-                     has ≥30 minutes of activity.
+        active_days: List of booleans (oldest → newest), or an int bitmask
+                     with the newest day in bit 0. An "active day" has
+                     ≥30 minutes of activity.
     """
-    if len(active_days) < WEEKLY_STREAK_DAYS:
+    if isinstance(active_days, int):
+        if active_days & _STREAK_MASK == _STREAK_MASK:
+            return POINTS_WEEKLY_STREAK_BONUS
         return 0
-    # Check the last 7 days
-    last_seven = active_days[-WEEKLY_STREAK_DAYS:]
-    if all(last_seven):
+    # Only the last 7 days count; all() stops at the first inactive one
+    if len(active_days) >= WEEKLY_STREAK_DAYS and all(active_days[-WEEKLY_STREAK_DAYS:]):
         return POINTS_WEEKLY_STREAK_BONUS
     return 0
 
@@ -125,6 +133,50 @@ def apply_daily_cap(points: int, already_earned_today: int) -> int:
 # ── Activity → Points Calculation ───────────────────────────────────
 
 
+def _parse_metrics(metrics: Any) -> Any:
+    """Return stored metrics as a dict; they arrive as a JSON string from the DB."""
+    if not isinstance(metrics, str):
+        return metrics
+    try:
+        return orjson.loads(metrics)
+    except orjson.JSONDecodeError:
+        return {}
+
+
+def _steps_points(activity: dict[str, Any], ctx: dict[str, Any]) -> int:
+    step_count = _parse_metrics(activity.get("metrics", {})).get("step_count", 0)
+    return calculate_step_points(step_count) + calculate_step_goal_bonus(step_count)
+
+
+def _workout_points(activity: dict[str, Any], ctx: dict[str, Any]) -> int:
+    duration = activity.get("duration_minutes", 0) or 0
+    points = calculate_workout_bonus(duration, ctx.get("workouts_today", 0))
+
+    # Also earn active minute points for workout duration
+    intensity = activity.get("intensity", "moderate")
+    if duration > 0 and intensity:
+        points += calculate_active_minute_points(duration, intensity)
+    return points
+
+
+def _active_minutes_points(activity: dict[str, Any], ctx: dict[str, Any]) -> int:
+    minutes = activity.get("duration_minutes", 0) or 0
+    if minutes == 0:
+        minutes = _parse_metrics(activity.get("metrics", {})).get("active_minutes", 0)
+    return calculate_active_minute_points(minutes, activity.get("intensity", "moderate"))
+
+
+def _no_points(activity: dict[str, Any], ctx: dict[str, Any]) -> int:
+    return 0
+
+
+_ACTIVITY_HANDLERS = {
+    "steps": _steps_points,
+    "workout": _workout_points,
+    "active_minutes": _active_minutes_points,
+}
+
+
 def calculate_activity_points(
     activity: dict[str, Any],
     daily_context: dict[str, Any] | None = None,
@@ -142,42 +194,8 @@ def calculate_activity_points(
     Returns:
         Points earned (before daily cap application — use apply_daily_cap separately).
     """
-    ctx = daily_context or {}
-    activity_type = activity.get("activity_type", "")
-    metrics = activity.get("metrics", {})
-    if isinstance(metrics, str):
-        import json
-
-        try:
-            metrics = json.loads(metrics)
-        except (json.JSONDecodeError, TypeError):
-            metrics = {}
-
-    points = 0
-
-    if activity_type == "steps":
-        step_count = metrics.get("step_count", 0)
-        points += calculate_step_points(step_count)
-        points += calculate_step_goal_bonus(step_count)
-
-    elif activity_type == "workout":
-        duration = activity.get("duration_minutes", 0) or 0
-        workouts_today = ctx.get("workouts_today", 0)
-        points += calculate_workout_bonus(duration, workouts_today)
-
-        # Also earn active minute points for workout duration
-        intensity = activity.get("intensity", "moderate")
-        if duration > 0 and intensity:
-            points += calculate_active_minute_points(duration, intensity)
-
-    elif activity_type == "active_minutes":
-        minutes = activity.get("duration_minutes", 0) or 0
-        if minutes == 0:
-            minutes = metrics.get("active_minutes", 0)
-        intensity = activity.get("intensity", "moderate")
-        points += calculate_active_minute_points(minutes, intensity)
-
-    return points
+    handler = _ACTIVITY_HANDLERS.get(activity.get("activity_type", ""), _no_points)
+    return handler(activity, daily_context or {})
 
 
 # ── Points Service ──────────────────────────────────────────────────
@@ -417,14 +435,7 @@ class PointsService:
         steps_today = 0
         for a in today_activities:
             if a.get("activity_type") == "steps":
-                metrics = a.get("metrics", {})
-                if isinstance(metrics, str):
-                    import json
-
-                    try:
-                        metrics = json.loads(metrics)
-                    except (json.JSONDecodeError, TypeError):
-                        metrics = {}
+                metrics = _parse_metrics(a.get("metrics", {}))
                 steps_today += metrics.get("step_count", 0)
 
         return {
@@ -10,6 +10,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from fittrack.services.cache import leaderboard_key
 from fittrack.services.leaderboard import VALID_PERIODS, LeaderboardService
 
 logger = logging.getLogger(__name__)
@@ -67,6 +68,8 @@ class LeaderboardWorker:
 
         for tier_code in all_tier_codes:
             result.tiers_processed += 1
+            # All periods for a tier are written to the cache in one batch
+            computed: dict[str, list[dict[str, Any]]] = {}
             for period in VALID_PERIODS:
                 try:
                     # _compute_live bypasses cache; we store the result
@@ -74,15 +77,17 @@ class LeaderboardWorker:
                     result.periods_processed += 1
                     result.entries_cached += len(rankings)
 
-                    # Push to cache
-                    if self.cache is not None:
-                        self.cache.set_leaderboard(period, tier_code, rankings, ttl=900)
+                    computed[leaderboard_key(period, tier_code)] = rankings
                 except Exception as e:
                     msg = f"Error computing {period}/{tier_code}: {e}"
                     logger.error(msg, exc_info=True)
                     result.errors.append(msg)
                     result.success = False
 
+            # Push to cache
+            if self.cache is not None and computed:
+                self.cache.set_many(computed, ttl=900)
+
         logger.info(
             "Leaderboard worker complete: %d tiers, %d periods, %d entries",
             result.tiers_processed,
@@ -6,7 +6,7 @@ import logging
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from fittrack.services.normalizer import detect_duplicate, normalize_activity
+from fittrack.services.normalizer import DuplicateIndex, normalize_activity
 from fittrack.services.providers.base import BaseProvider, ProviderError
 from fittrack.services.trackers import _decrypt_token
 
@@ -168,11 +168,14 @@ class SyncWorker:
         except Exception:
             existing = []
 
+        # Index them once; each stored activity is added for later dedup checks
+        dup_index = DuplicateIndex(user_id, existing)
+
         # Process each activity
         for raw in raw_activities:
             try:
                 # Deduplicate
-                dup_id = detect_duplicate(raw, user_id, existing)
+                dup_id = dup_index.find(raw)
                 if dup_id:
                     result.duplicates_skipped += 1
                     continue
@@ -208,8 +211,8 @@ class SyncWorker:
                 except Exception as e:
                     result.errors.append(f"Points error: {e}")
 
-                # Add to existing list for subsequent dedup checks
-                existing.append(activity_data)
+                # Index it for subsequent dedup checks
+                dup_index.add(activity_data)
 
             except Exception as e:
                 result.errors.append(f"Activity processing error: {e}")
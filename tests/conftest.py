@@ -4,16 +4,62 @@ from __future__ import annotations
 
 import os
 import sys
-from collections.abc import Generator
+from collections.abc import AsyncIterator, Callable, Generator
+from types import ModuleType
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+import hypothesis
 import pytest
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 # Ensure src is on the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
+# ── Hypothesis profiles ──────────────────────────────────────────────
+#
+# The property tests cover small pure-arithmetic functions, so a couple of
+# dozen examples hit every equivalence class. HYPOTHESIS_PROFILE=thorough
+# runs a much deeper search.
+
+hypothesis.settings.register_profile("fast", max_examples=25, deadline=None)
+hypothesis.settings.register_profile("thorough", max_examples=500, deadline=None)
+hypothesis.settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "fast"))
+
+
+# ── Optional per-test profiling (pytest --profile) ───────────────────
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Profile each test with pyinstrument; HTML reports go to prof/.",
+    )
+
+
+@pytest.fixture(autouse=True)
+def _profile_test(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+    """Wrap the test in a pyinstrument profiler when ``--profile`` is given."""
+    if not request.config.getoption("--profile"):
+        yield
+        return
+
+    from pathlib import Path
+
+    from pyinstrument import Profiler
+
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+    yield
+    profiler.stop()
+    out_dir = Path(request.config.rootpath) / "prof"
+    out_dir.mkdir(exist_ok=True)
+    name = request.node.nodeid.replace("/", ".").replace("::", "-")
+    profiler.write_html(out_dir / f"{name}.html")
+
 
 class MockCursor:
     """Mock Oracle cursor supporting context manager and common operations."""
@@ -104,29 +150,86 @@ def mock_cursor(mock_connection: MockConnection) -> MockCursor:
 @pytest.fixture
 def patch_db_pool(mock_pool: MockPool) -> Generator[MockPool, None, None]:
     """Patch the database module to use mock pool."""
+    from fittrack.core import database
+
+    # patch.object on the module skips resolving a dotted path per patch,
+    # which adds up since every route test goes through this fixture.
     with (
-        patch("fittrack.core.database._pool", mock_pool),
-        patch("fittrack.core.database.get_pool", return_value=mock_pool),
-        patch("fittrack.core.database.get_connection", return_value=mock_pool.acquire()),
+        patch.object(database, "_pool", mock_pool),
+        patch.object(database, "get_pool", return_value=mock_pool),
+        patch.object(database, "get_connection", return_value=mock_pool.acquire()),
     ):
         yield mock_pool
 
 
-@pytest.fixture
-def app(patch_db_pool: MockPool):  # type: ignore[no-untyped-def]
-    """Create a FastAPI test app with mocked database."""
+@pytest.fixture(scope="session")
+def _session_app():  # type: ignore[no-untyped-def]
+    """Build the FastAPI test app once; routes reach the DB via get_pool() per request."""
     from fittrack.core.config import Settings
     from fittrack.main import create_app
 
     settings = Settings(app_env="testing")
-    application = create_app(settings=settings)
-    return application
+    return create_app(settings=settings)
 
 
 @pytest.fixture
-def client(app):  # type: ignore[no-untyped-def]
-    """Create a test client."""
-    return TestClient(app)
+def app(_session_app, patch_db_pool: MockPool):  # type: ignore[no-untyped-def]
+    """The shared test app, with this test's mock pool patched in."""
+    yield _session_app
+    _session_app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def _session_client(_session_app):  # type: ignore[no-untyped-def]
+    return TestClient(_session_app)
+
+
+@pytest.fixture
+def client(app, _session_client):  # type: ignore[no-untyped-def]
+    """Create a test client.
+
+    One TestClient is shared by the whole session; cookies are cleared so no
+    state carries over between tests. The client is not entered as a context
+    manager, so the app's lifespan (DB pool startup/shutdown) never runs; the
+    database is mocked instead.
+    """
+    _session_client.cookies.clear()
+    return _session_client
+
+
+@pytest.fixture(scope="session")
+def _session_user_client(_session_app, user_headers: dict[str, str]):  # type: ignore[no-untyped-def]
+    return TestClient(_session_app, headers=user_headers)
+
+
+@pytest.fixture(scope="session")
+def _session_admin_client(_session_app, admin_headers: dict[str, str]):  # type: ignore[no-untyped-def]
+    return TestClient(_session_app, headers=admin_headers)
+
+
+@pytest.fixture
+def user_client(app, _session_user_client):  # type: ignore[no-untyped-def]
+    """Like ``client``, but every request carries the regular user's token."""
+    _session_user_client.cookies.clear()
+    return _session_user_client
+
+
+@pytest.fixture
+def admin_client(app, _session_admin_client):  # type: ignore[no-untyped-def]
+    """Like ``client``, but every request carries the admin's token."""
+    _session_admin_client.cookies.clear()
+    return _session_admin_client
+
+
+@pytest.fixture
+async def async_client(app) -> AsyncIterator[AsyncClient]:  # type: ignore[no-untyped-def]
+    """Create an async client that calls the app in-process over ASGI.
+
+    ``ASGITransport`` does not send lifespan events, so startup is skipped
+    just as with the ``client`` fixture.
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
 
 
 # ── Helper for setting up mock query results ─────────────────────────
@@ -144,9 +247,12 @@ def set_mock_query_result(
 
 
 # ── Auth helpers for protected route tests ───────────────────────────
+#
+# Tokens are signed once per session: the signing secret is fixed for the
+# whole run and the 60-minute expiry comfortably outlives the suite.
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def admin_headers() -> dict[str, str]:
     """Return Authorization headers with a valid admin JWT."""
     from fittrack.core.security import create_access_token
@@ -155,10 +261,29 @@ def admin_headers() -> dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def user_headers() -> dict[str, str]:
     """Return Authorization headers with a valid user JWT."""
     from fittrack.core.security import create_access_token
 
     token = create_access_token(subject="test-user", role="user")
     return {"Authorization": f"Bearer {token}"}
+
+
+# ── Route service doubles ────────────────────────────────────────────
+
+
+@pytest.fixture
+def svc_mock(monkeypatch: pytest.MonkeyPatch) -> Callable[..., MagicMock]:
+    """Install a MagicMock as a route module's ``_get_service()`` result.
+
+    Keyword arguments become method return values, e.g.
+    ``svc_mock(notifications, get_unread_count=3)``.
+    """
+
+    def _install(route_module: ModuleType, **returns: Any) -> MagicMock:
+        svc = MagicMock(**{f"{name}.return_value": value for name, value in returns.items()})
+        monkeypatch.setattr(route_module, "_get_service", lambda: svc)
+        return svc
+
+    return _install
@@ -43,7 +43,9 @@ def _oracle_available() -> bool:
 _SKIP_REASON = "Oracle DB not reachable (set ORACLE_DSN or start Docker)"
 _oracle_ok = _oracle_available()
 
-pytestmark = pytest.mark.integration
+# Live Oracle/Redis connections are the point here; unit tests run with
+# sockets disabled (see addopts).
+pytestmark = [pytest.mark.integration, pytest.mark.enable_socket]
 
 
 # ── Fixtures ────────────────────────────────────────────────────────
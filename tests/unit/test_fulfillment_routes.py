@@ -2,23 +2,52 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from unittest.mock import MagicMock, patch
 
-from fastapi.testclient import TestClient
+import orjson
+import pytest
+from httpx import AsyncClient
+
+from fittrack.services.fulfillments import FulfillmentError
+
+_LIST_URL = "/api/v1/fulfillments"
+_DETAIL_URL = f"{_LIST_URL}/f1"
+_MISSING_URL = f"{_LIST_URL}/nope"
+_NOTIFY_URL = f"{_DETAIL_URL}/notify"
+_SHIP_URL = f"{_DETAIL_URL}/ship?carrier=UPS&tracking_number=1Z123"
+_DELIVER_URL = f"{_DETAIL_URL}/deliver"
+_FORFEIT_URL = f"{_DETAIL_URL}/forfeit"
+_CONFIRM_URL = f"{_DETAIL_URL}/confirm-address"
+
+_STUB_ADDR = {"street": "x", "city": "x", "state": "x", "zip_code": "x"}
+_REAL_ADDR = {"street": "123 Main St", "city": "Anytown", "state": "CA", "zip_code": "90210"}
+
+
+class _FulfillmentServiceStub:
+    """Bare service double; each test assigns the one method its route calls."""
+
+
+@pytest.fixture(scope="module")
+def svc_stub() -> Iterator[_FulfillmentServiceStub]:
+    """Install one stub as the route's service for the whole module."""
+    stub = _FulfillmentServiceStub()
+    with patch("fittrack.api.routes.fulfillments._get_service", new=lambda: stub):
+        yield stub
 
 
 class TestFulfillmentListRoute:
     """Test GET /api/v1/fulfillments (admin)."""
 
-    def test_list_requires_admin(self, client: TestClient, user_headers: dict) -> None:
-        resp = client.get("/api/v1/fulfillments", headers=user_headers)
+    async def test_list_requires_admin(self, async_client: AsyncClient, user_headers: dict) -> None:
+        resp = await async_client.get(_LIST_URL, headers=user_headers)
         assert resp.status_code == 403
 
     @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_list_fulfillments(
+    async def test_list_fulfillments(
         self,
         mock_factory: MagicMock,
-        client: TestClient,
+        async_client: AsyncClient,
         admin_headers: dict,
     ) -> None:
         mock_svc = MagicMock()
@@ -27,7 +56,7 @@ class TestFulfillmentListRoute:
             "pagination": {"page": 1, "limit": 20, "total_items": 1, "total_pages": 1},
         }
         mock_factory.return_value = mock_svc
-        resp = client.get("/api/v1/fulfillments", headers=admin_headers)
+        resp = await async_client.get(_LIST_URL, headers=admin_headers)
         assert resp.status_code == 200
         assert len(resp.json()["items"]) == 1
 
@@ -36,141 +65,96 @@ class TestFulfillmentGetRoute:
     """Test GET /api/v1/fulfillments/{id} (admin)."""
 
     @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_get_fulfillment(
-        self,
-        mock_factory: MagicMock,
-        client: TestClient,
-        admin_headers: dict,
-    ) -> None:
-        mock_svc = MagicMock()
-        mock_svc.get_fulfillment.return_value = {
-            "fulfillment_id": "f1",
-            "status": "pending",
-        }
-        mock_factory.return_value = mock_svc
-        resp = client.get("/api/v1/fulfillments/f1", headers=admin_headers)
-        assert resp.status_code == 200
-
-    @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_get_not_found(
+    async def test_get_not_found(
         self,
         mock_factory: MagicMock,
-        client: TestClient,
+        async_client: AsyncClient,
         admin_headers: dict,
     ) -> None:
-        from fittrack.services.fulfillments import FulfillmentError
-
         mock_svc = MagicMock()
         mock_svc.get_fulfillment.side_effect = FulfillmentError("not found", 404)
         mock_factory.return_value = mock_svc
-        resp = client.get("/api/v1/fulfillments/nope", headers=admin_headers)
+        resp = await async_client.get(_MISSING_URL, headers=admin_headers)
         assert resp.status_code == 404
 
 
-class TestNotifyRoute:
-    """Test POST /api/v1/fulfillments/{id}/notify (admin)."""
-
-    @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_notify_winner(
-        self,
-        mock_factory: MagicMock,
-        client: TestClient,
-        admin_headers: dict,
-    ) -> None:
-        mock_svc = MagicMock()
-        mock_svc.notify_winner.return_value = {
-            "fulfillment_id": "f1",
-            "status": "winner_notified",
-        }
-        mock_factory.return_value = mock_svc
-        resp = client.post("/api/v1/fulfillments/f1/notify", headers=admin_headers)
-        assert resp.status_code == 200
-        assert resp.json()["status"] == "winner_notified"
-
-
-class TestShipRoute:
-    """Test POST /api/v1/fulfillments/{id}/ship (admin)."""
-
-    @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_ship_prize(
-        self,
-        mock_factory: MagicMock,
-        client: TestClient,
-        admin_headers: dict,
-    ) -> None:
-        mock_svc = MagicMock()
-        mock_svc.ship_prize.return_value = {
-            "fulfillment_id": "f1",
-            "status": "shipped",
-            "carrier": "UPS",
-            "tracking_number": "1Z123",
-        }
-        mock_factory.return_value = mock_svc
-        resp = client.post(
-            "/api/v1/fulfillments/f1/ship?carrier=UPS&tracking_number=1Z123",
-            headers=admin_headers,
-        )
-        assert resp.status_code == 200
-        assert resp.json()["status"] == "shipped"
-
-
-class TestDeliverRoute:
-    """Test POST /api/v1/fulfillments/{id}/deliver (admin)."""
-
-    @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_mark_delivered(
-        self,
-        mock_factory: MagicMock,
-        client: TestClient,
-        admin_headers: dict,
-    ) -> None:
-        mock_svc = MagicMock()
-        mock_svc.mark_delivered.return_value = {
-            "fulfillment_id": "f1",
-            "status": "delivered",
-        }
-        mock_factory.return_value = mock_svc
-        resp = client.post("/api/v1/fulfillments/f1/deliver", headers=admin_headers)
-        assert resp.status_code == 200
-        assert resp.json()["status"] == "delivered"
-
-
-class TestForfeitRoute:
-    """Test POST /api/v1/fulfillments/{id}/forfeit (admin)."""
-
-    @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_forfeit(
+class TestFulfillmentLifecycleRoutes:
+    """Test the admin get/notify/ship/deliver/forfeit endpoints."""
+
+    @pytest.mark.parametrize(
+        ("method", "path", "svc_method", "ret"),
+        [
+            (
+                "GET",
+                _DETAIL_URL,
+                "get_fulfillment",
+                {"fulfillment_id": "f1", "status": "pending"},
+            ),
+            (
+                "POST",
+                _NOTIFY_URL,
+                "notify_winner",
+                {"fulfillment_id": "f1", "status": "winner_notified"},
+            ),
+            (
+                "POST",
+                _SHIP_URL,
+                "ship_prize",
+                {
+                    "fulfillment_id": "f1",
+                    "status": "shipped",
+                    "carrier": "UPS",
+                    "tracking_number": "1Z123",
+                },
+            ),
+            (
+                "POST",
+                _DELIVER_URL,
+                "mark_delivered",
+                {"fulfillment_id": "f1", "status": "delivered"},
+            ),
+            (
+                "POST",
+                _FORFEIT_URL,
+                "forfeit",
+                {"fulfillment_id": "f1", "status": "forfeited"},
+            ),
+        ],
+        ids=["get", "notify", "ship", "deliver", "forfeit"],
+    )
+    async def test_lifecycle(
         self,
-        mock_factory: MagicMock,
-        client: TestClient,
+        method: str,
+        path: str,
+        svc_method: str,
+        ret: dict,
+        svc_stub: _FulfillmentServiceStub,
+        async_client: AsyncClient,
         admin_headers: dict,
     ) -> None:
-        mock_svc = MagicMock()
-        mock_svc.forfeit.return_value = {
-            "fulfillment_id": "f1",
-            "status": "forfeited",
-        }
-        mock_factory.return_value = mock_svc
-        resp = client.post("/api/v1/fulfillments/f1/forfeit", headers=admin_headers)
+        setattr(svc_stub, svc_method, lambda *args, **kwargs: ret)
+        resp = await async_client.request(method, path, headers=admin_headers)
         assert resp.status_code == 200
-        assert resp.json()["status"] == "forfeited"
+        # The route passes the service result through unchanged, so the body
+        # is exactly its compact JSON encoding.
+        assert resp.content == orjson.dumps(ret)
 
 
 class TestConfirmAddressRoute:
     """Test POST /api/v1/fulfillments/{id}/confirm-address (winner)."""
 
-    def test_requires_auth(self, client: TestClient) -> None:
-        resp = client.post(
-            "/api/v1/fulfillments/f1/confirm-address",
-            json={"street": "x", "city": "x", "state": "x", "zip_code": "x"},
+    async def test_requires_auth(self, async_client: AsyncClient) -> None:
+        resp = await async_client.post(
+            _CONFIRM_URL,
+            json=_STUB_ADDR,
         )
         assert resp.status_code == 401
 
     @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_wrong_user_is_forbidden(
+    async def test_wrong_user_is_forbidden(
         self,
         mock_factory: MagicMock,
-        client: TestClient,
+        async_client: AsyncClient,
         user_headers: dict,
     ) -> None:
         mock_svc = MagicMock()
@@ -180,18 +164,18 @@ class TestConfirmAddressRoute:
             "status": "winner_notified",
         }
         mock_factory.return_value = mock_svc
-        resp = client.post(
-            "/api/v1/fulfillments/f1/confirm-address",
-            json={"street": "x", "city": "x", "state": "x", "zip_code": "x"},
+        resp = await async_client.post(
+            _CONFIRM_URL,
+            json=_STUB_ADDR,
             headers=user_headers,
         )
         assert resp.status_code == 403
 
     @patch("fittrack.api.routes.fulfillments._get_service")
-    def test_confirm_address_success(
+    async def test_confirm_address_success(
         self,
         mock_factory: MagicMock,
-        client: TestClient,
+        async_client: AsyncClient,
         user_headers: dict,
     ) -> None:
         mock_svc = MagicMock()
@@ -205,14 +189,9 @@ class TestConfirmAddressRoute:
             "status": "address_confirmed",
         }
         mock_factory.return_value = mock_svc
-        resp = client.post(
-            "/api/v1/fulfillments/f1/confirm-address",
-            json={
-                "street": "123 Main St",
-                "city": "Anytown",
-                "state": "CA",
-                "zip_code": "90210",
-            },
+        resp = await async_client.post(
+            _CONFIRM_URL,
+            json=_REAL_ADDR,
             headers=user_headers,
         )
         assert resp.status_code == 200
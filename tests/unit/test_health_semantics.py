@@ -8,11 +8,14 @@ Covers:
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from typing import Any
-from unittest.mock import MagicMock
 
+import orjson
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 from fittrack.core.config import Settings
 from fittrack.main import create_app
@@ -20,8 +23,12 @@ from fittrack.main import create_app
 # ── Fixtures ─────────────────────────────────────────────────────────
 
 
+def _asgi_client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
 @pytest.fixture
-def dev_app() -> Any:
+def dev_app() -> FastAPI:
     """App in development mode (no DB pool)."""
     settings = Settings(app_env="development")
     application = create_app(settings=settings)
@@ -29,12 +36,13 @@ def dev_app() -> Any:
 
 
 @pytest.fixture
-def dev_client(dev_app: Any) -> TestClient:
-    return TestClient(dev_app)
+async def dev_client(dev_app: FastAPI) -> AsyncIterator[AsyncClient]:
+    async with _asgi_client(dev_app) as client:
+        yield client
 
 
 @pytest.fixture
-def prod_app() -> Any:
+def prod_app() -> FastAPI:
     """App in production mode (no DB pool)."""
     settings = Settings(app_env="production")
     application = create_app(settings=settings)
@@ -42,55 +50,84 @@ def prod_app() -> Any:
 
 
 @pytest.fixture
-def prod_client(prod_app: Any) -> TestClient:
-    return TestClient(prod_app)
+async def prod_client(prod_app: FastAPI) -> AsyncIterator[AsyncClient]:
+    async with _asgi_client(prod_app) as client:
+        yield client
 
 
-@pytest.fixture
-def app_with_healthy_db() -> Any:
-    """App with a mock DB pool that responds to queries."""
-    settings = Settings(app_env="development")
-    application = create_app(settings=settings)
+@pytest.fixture(scope="session")
+def openapi_schema() -> dict[str, Any]:
+    """OpenAPI document from a development app, generated once per session."""
+    client = TestClient(create_app(settings=Settings(app_env="development")))
+    resp = client.get("/openapi.json")
+    assert resp.status_code == 200
+    return orjson.loads(resp.content)  # type: ignore[no-any-return]
+
+
+class _FakeCursor:
+    """Cursor stub that answers the readiness probe's SELECT 1."""
+
+    def __enter__(self) -> _FakeCursor:
+        return self
+
+    def __exit__(self, *args: Any) -> bool:
+        return False
+
+    def execute(self, *args: Any) -> None:
+        pass
+
+    def fetchone(self) -> tuple[int]:
+        return (1,)
+
 
-    # Mock a healthy DB pool
-    mock_cursor = MagicMock()
-    mock_cursor.execute = MagicMock()
-    mock_cursor.fetchone = MagicMock(return_value=(1,))
-    mock_cursor.__enter__ = MagicMock(return_value=mock_cursor)
-    mock_cursor.__exit__ = MagicMock(return_value=False)
+class _FakeConnection:
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor()
 
-    mock_conn = MagicMock()
-    mock_conn.cursor.return_value = mock_cursor
-    mock_conn.close = MagicMock()
+    def close(self) -> None:
+        pass
 
-    mock_pool = MagicMock()
-    mock_pool.acquire.return_value = mock_conn
 
-    application.state.db_pool = mock_pool
+class _FakePool:
+    """Connection pool stub; ``broken`` pools fail on acquire."""
+
+    def __init__(self, broken: bool = False) -> None:
+        self.broken = broken
+
+    def acquire(self) -> _FakeConnection:
+        if self.broken:
+            raise RuntimeError("Connection refused")
+        return _FakeConnection()
+
+
+@pytest.fixture(scope="module")
+def app_with_healthy_db() -> FastAPI:
+    """App with a stub DB pool that responds to queries."""
+    settings = Settings(app_env="development")
+    application = create_app(settings=settings)
+    application.state.db_pool = _FakePool()
     return application
 
 
 @pytest.fixture
-def client_with_db(app_with_healthy_db: Any) -> TestClient:
-    return TestClient(app_with_healthy_db)
+async def client_with_db(app_with_healthy_db: FastAPI) -> AsyncIterator[AsyncClient]:
+    async with _asgi_client(app_with_healthy_db) as client:
+        yield client
 
 
-@pytest.fixture
-def app_with_broken_db() -> Any:
-    """App with a mock DB pool that raises on query."""
+@pytest.fixture(scope="module")
+def app_with_broken_db() -> FastAPI:
+    """App with a stub DB pool that raises on acquire."""
     settings = Settings(app_env="production")
     application = create_app(settings=settings)
-
-    mock_pool = MagicMock()
-    mock_pool.acquire.side_effect = Exception("Connection refused")
-
-    application.state.db_pool = mock_pool
+    application.state.db_pool = _FakePool(broken=True)
     return application
 
 
 @pytest.fixture
-def client_with_broken_db(app_with_broken_db: Any) -> TestClient:
-    return TestClient(app_with_broken_db)
+async def client_with_broken_db(app_with_broken_db: FastAPI) -> AsyncIterator[AsyncClient]:
+    async with _asgi_client(app_with_broken_db) as client:
+        yield client
 
 
 # ── B1: API Startup ─────────────────────────────────────────────────
@@ -99,22 +136,22 @@ def client_with_broken_db(app_with_broken_db: Any) -> TestClient:
 class TestB1ApiStartup:
     """B1) API starts and responds to basic requests."""
 
-    def test_dev_app_starts_without_db(self, dev_client: TestClient) -> None:
+    async def test_dev_app_starts_without_db(self, dev_client: AsyncClient) -> None:
         """API in dev mode starts even without Oracle database."""
-        resp = dev_client.get("/health")
+        resp = await dev_client.get("/health")
         assert resp.status_code == 200
         assert resp.json()["status"] == "ok"
 
-    def test_health_returns_environment(self, dev_client: TestClient) -> None:
-        resp = dev_client.get("/health")
+    async def test_health_returns_environment(self, dev_client: AsyncClient) -> None:
+        resp = await dev_client.get("/health")
         assert resp.json()["environment"] == "development"
 
-    def test_health_shows_db_disconnected_without_pool(self, dev_client: TestClient) -> None:
-        resp = dev_client.get("/health")
+    async def test_health_shows_db_disconnected_without_pool(self, dev_client: AsyncClient) -> None:
+        resp = await dev_client.get("/health")
         assert resp.json()["database"] == "disconnected"
 
-    def test_health_shows_db_connected_with_pool(self, client_with_db: TestClient) -> None:
-        resp = client_with_db.get("/health")
+    async def test_health_shows_db_connected_with_pool(self, client_with_db: AsyncClient) -> None:
+        resp = await client_with_db.get("/health")
         assert resp.json()["database"] == "connected"
 
 
@@ -126,53 +163,53 @@ class TestB2HealthSemantics:
 
     # -- /health/live: always 200 if process is alive --
 
-    def test_liveness_200_without_db(self, dev_client: TestClient) -> None:
+    async def test_liveness_200_without_db(self, dev_client: AsyncClient) -> None:
         """/health/live returns 200 regardless of DB state."""
-        resp = dev_client.get("/health/live")
+        resp = await dev_client.get("/health/live")
         assert resp.status_code == 200
         assert resp.json()["status"] == "alive"
 
-    def test_liveness_200_with_db(self, client_with_db: TestClient) -> None:
-        resp = client_with_db.get("/health/live")
+    async def test_liveness_200_with_db(self, client_with_db: AsyncClient) -> None:
+        resp = await client_with_db.get("/health/live")
         assert resp.status_code == 200
         assert resp.json()["status"] == "alive"
 
-    def test_liveness_no_db_dependency(self, prod_client: TestClient) -> None:
+    async def test_liveness_no_db_dependency(self, prod_client: AsyncClient) -> None:
         """/health/live in production mode still returns 200 without DB."""
-        resp = prod_client.get("/health/live")
+        resp = await prod_client.get("/health/live")
         assert resp.status_code == 200
         assert resp.json()["status"] == "alive"
 
     # -- /health/ready: depends on DB --
 
-    def test_readiness_200_when_db_healthy(self, client_with_db: TestClient) -> None:
+    async def test_readiness_200_when_db_healthy(self, client_with_db: AsyncClient) -> None:
         """/health/ready returns 200 when DB responds to SELECT 1."""
-        resp = client_with_db.get("/health/ready")
+        resp = await client_with_db.get("/health/ready")
         assert resp.status_code == 200
         data = resp.json()
         assert data["status"] == "ready"
         assert data["checks"]["database"]["status"] == "ok"
         assert "response_time_ms" in data["checks"]["database"]
 
-    def test_readiness_503_when_db_broken(self, client_with_broken_db: TestClient) -> None:
+    async def test_readiness_503_when_db_broken(self, client_with_broken_db: AsyncClient) -> None:
         """/health/ready returns 503 when DB connection fails."""
-        resp = client_with_broken_db.get("/health/ready")
+        resp = await client_with_broken_db.get("/health/ready")
         assert resp.status_code == 503
         data = resp.json()
         assert data["status"] == "not_ready"
         assert data["checks"]["database"]["status"] == "error"
 
-    def test_readiness_dev_no_db_is_still_ready(self, dev_client: TestClient) -> None:
+    async def test_readiness_dev_no_db_is_still_ready(self, dev_client: AsyncClient) -> None:
         """In dev mode, missing DB pool doesn't make us unready (graceful degradation)."""
-        resp = dev_client.get("/health/ready")
+        resp = await dev_client.get("/health/ready")
         assert resp.status_code == 200
         data = resp.json()
         assert data["status"] == "ready"
         assert data["checks"]["database"]["status"] == "not_configured"
 
-    def test_readiness_prod_no_db_is_not_ready(self, prod_client: TestClient) -> None:
+    async def test_readiness_prod_no_db_is_not_ready(self, prod_client: AsyncClient) -> None:
         """In production, missing DB pool means not ready (503)."""
-        resp = prod_client.get("/health/ready")
+        resp = await prod_client.get("/health/ready")
         assert resp.status_code == 503
         data = resp.json()
         assert data["status"] == "not_ready"
@@ -184,21 +221,25 @@ class TestB2HealthSemantics:
 class TestB3SwaggerDev:
     """B3) /docs Swagger UI available in development mode."""
 
-    def test_docs_available_in_dev(self, dev_client: TestClient) -> None:
+    async def test_docs_available_in_dev(self, dev_client: AsyncClient) -> None:
         """GET /docs loads Swagger UI in development mode."""
-        resp = dev_client.get("/docs")
+        resp = await dev_client.get("/docs")
         assert resp.status_code == 200
         assert "swagger" in resp.text.lower()
 
-    def test_redoc_available_in_dev(self, dev_client: TestClient) -> None:
+    async def test_redoc_available_in_dev(self, dev_client: AsyncClient) -> None:
         """GET /redoc also available."""
-        resp = dev_client.get("/redoc")
+        resp = await dev_client.get("/redoc")
         assert resp.status_code == 200
 
-    def test_openapi_json_available(self, dev_client: TestClient) -> None:
+    def test_openapi_json_available(self, openapi_schema: dict[str, Any]) -> None:
         """OpenAPI JSON schema is served."""
-        resp = dev_client.get("/openapi.json")
-        assert resp.status_code == 200
-        data = resp.json()
-        assert "paths" in data
-        assert len(data["paths"]) > 50  # we have ~76 paths
+        assert "paths" in openapi_schema
+        assert len(openapi_schema["paths"]) > 50  # we have ~76 paths
+
+    def test_openapi_schema_built_at_startup(self) -> None:
+        """Lifespan startup generates and memoizes the OpenAPI schema."""
+        application = create_app(settings=Settings(app_env="testing"))
+        assert application.openapi_schema is None
+        with TestClient(application):
+            assert application.openapi_schema is not None
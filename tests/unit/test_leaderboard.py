@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
+import fnmatch
+import sys
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterator, Sequence
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
 from typing import Any
 
 import pytest
+from freezegun import freeze_time
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
 from fittrack.services.leaderboard import (
     EST,
@@ -17,6 +27,17 @@ from fittrack.services.leaderboard import (
     get_period_start,
 )
 
+# Every test runs at a fixed instant (a Thursday) so period boundaries and
+# "now"-relative data are reproducible.
+_NOW = datetime(2026, 1, 15, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def frozen_now() -> Iterator[None]:
+    with freeze_time(_NOW):
+        yield
+
+
 # ── Period boundary helpers ─────────────────────────────────────────
 
 
@@ -54,6 +75,12 @@ class TestGetPeriodStart:
         with pytest.raises(LeaderboardError, match="Invalid period"):
             get_period_start("hourly")
 
+    def test_seconds_do_not_change_start(self):
+        now = datetime(2026, 1, 15, 4, 59, 1, 500, tzinfo=UTC)
+        assert get_period_start("daily", now) == get_period_start(
+            "daily", now.replace(second=59, microsecond=999999)
+        )
+
 
 class TestGetPeriodEnd:
     def test_returns_now(self):
@@ -63,13 +90,62 @@ class TestGetPeriodEnd:
 
     def test_defaults_to_now(self):
         end = get_period_end("daily")
-        assert end.tzinfo is not None
-        assert (datetime.now(tz=UTC) - end).total_seconds() < 2
+        assert end == _NOW
 
 
 # ── compute_rankings ───────────────────────────────────────────────
 
 
+@pytest.fixture(scope="session")
+def entries_100() -> list[dict[str, Any]]:
+    """100 unranked entries; compute_rankings copies rather than mutates them."""
+    return [{"user_id": f"u{i}", "points_earned": i * 10, "active_days": i} for i in range(100)]
+
+
+_EA = datetime(2026, 1, 15, 10, 0, tzinfo=UTC)
+
+# Equal points in every case; each pair differs only in the field under test.
+_TIE_BREAK_CASES = [
+    pytest.param(
+        [
+            {"user_id": "u1", "points_earned": 200, "earliest_achievement": _EA, "active_days": 3},
+            {
+                "user_id": "u2",
+                "points_earned": 200,
+                "earliest_achievement": _EA - timedelta(hours=2),
+                "active_days": 3,
+            },
+        ],
+        ["u2", "u1"],
+        id="earlier-achievement-wins",
+    ),
+    pytest.param(
+        [
+            {"user_id": "u1", "points_earned": 200, "earliest_achievement": _EA, "active_days": 3},
+            {"user_id": "u2", "points_earned": 200, "earliest_achievement": _EA, "active_days": 5},
+        ],
+        ["u2", "u1"],
+        id="more-active-days-wins",
+    ),
+    pytest.param(
+        [
+            {"user_id": "u_beta", "points_earned": 200, "earliest_achievement": _EA},
+            {"user_id": "u_alpha", "points_earned": 200, "earliest_achievement": _EA},
+        ],
+        ["u_alpha", "u_beta"],
+        id="alphabetical-user-id",
+    ),
+    pytest.param(
+        [
+            {"user_id": "u1", "points_earned": 100, "earliest_achievement": None},
+            {"user_id": "u2", "points_earned": 100, "earliest_achievement": _EA},
+        ],
+        ["u2", "u1"],
+        id="missing-achievement-sorts-last",
+    ),
+]
+
+
 class TestComputeRankings:
     def test_sort_by_points_descending(self):
         entries = [
@@ -85,62 +161,9 @@ class TestComputeRankings:
         assert ranked[2]["user_id"] == "u1"
         assert ranked[2]["rank"] == 3
 
-    def test_tie_break_earliest_achievement(self):
-        entries = [
-            {
-                "user_id": "u1",
-                "points_earned": 200,
-                "earliest_achievement": datetime(2026, 1, 15, 10, 0, tzinfo=UTC),
-                "active_days": 3,
-            },
-            {
-                "user_id": "u2",
-                "points_earned": 200,
-                "earliest_achievement": datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-                "active_days": 3,
-            },
-        ]
-        ranked = compute_rankings(entries)
-        assert ranked[0]["user_id"] == "u2"  # Earlier achievement wins
-        assert ranked[1]["user_id"] == "u1"
-
-    def test_tie_break_more_active_days(self):
-        ea = datetime(2026, 1, 15, 10, 0, tzinfo=UTC)
-        entries = [
-            {
-                "user_id": "u1",
-                "points_earned": 200,
-                "earliest_achievement": ea,
-                "active_days": 3,
-            },
-            {
-                "user_id": "u2",
-                "points_earned": 200,
-                "earliest_achievement": ea,
-                "active_days": 5,
-            },
-        ]
-        ranked = compute_rankings(entries)
-        assert ranked[0]["user_id"] == "u2"  # More active days wins
-
-    def test_tie_break_user_id(self):
-        ea = datetime(2026, 1, 15, 10, 0, tzinfo=UTC)
-        entries = [
-            {
-                "user_id": "u_beta",
-                "points_earned": 200,
-                "earliest_achievement": ea,
-                "active_days": 3,
-            },
-            {
-                "user_id": "u_alpha",
-                "points_earned": 200,
-                "earliest_achievement": ea,
-                "active_days": 3,
-            },
-        ]
-        ranked = compute_rankings(entries)
-        assert ranked[0]["user_id"] == "u_alpha"  # Alphabetical user_id
+    @pytest.mark.parametrize(("entries", "expected"), _TIE_BREAK_CASES)
+    def test_tie_break(self, entries: list[dict[str, Any]], expected: list[str]):
+        assert [r["user_id"] for r in compute_rankings(entries)] == expected
 
     def test_empty_list(self):
         assert compute_rankings([]) == []
@@ -160,19 +183,6 @@ class TestComputeRankings:
         assert ranked[0]["user_id"] == "u2"
         assert ranked[1]["user_id"] == "u1"
 
-    def test_none_earliest_achievement(self):
-        """Users with no earliest_achievement sort last among ties."""
-        entries = [
-            {"user_id": "u1", "points_earned": 100, "earliest_achievement": None},
-            {
-                "user_id": "u2",
-                "points_earned": 100,
-                "earliest_achievement": datetime(2026, 1, 15, 10, 0, tzinfo=UTC),
-            },
-        ]
-        ranked = compute_rankings(entries)
-        assert ranked[0]["user_id"] == "u2"
-
     def test_string_earliest_achievement(self):
         entries = [
             {
@@ -189,65 +199,117 @@ class TestComputeRankings:
         ranked = compute_rankings(entries)
         assert ranked[0]["user_id"] == "u2"
 
-    def test_large_leaderboard(self):
+    def test_unparseable_string_sorts_after_valid(self):
         entries = [
-            {"user_id": f"u{i}", "points_earned": i * 10, "active_days": i} for i in range(100)
+            {"user_id": "u1", "points_earned": 100, "earliest_achievement": "not-a-date"},
+            {"user_id": "u2", "points_earned": 100, "earliest_achievement": "2026-01-15T08:00"},
         ]
         ranked = compute_rankings(entries)
+        assert [e["user_id"] for e in ranked] == ["u2", "u1"]
+
+    def test_large_leaderboard(self, entries_100):
+        ranked = compute_rankings(entries_100)
         assert len(ranked) == 100
         assert ranked[0]["user_id"] == "u99"
         assert ranked[0]["rank"] == 1
         assert ranked[99]["user_id"] == "u0"
         assert ranked[99]["rank"] == 100
 
+    def test_production_sized_leaderboard(self):
+        entries = [
+            {"user_id": f"u{i:05d}", "points_earned": i % 250, "active_days": i % 7}
+            for i in range(10_000)
+        ]
+        ranked = compute_rankings(entries)
+        assert [e["rank"] for e in ranked] == list(range(1, 10_001))
+        keys = [(-e["points_earned"], -e["active_days"], e["user_id"]) for e in ranked]
+        assert keys == sorted(keys)
+
+    def test_duplicate_entries_keep_input_order(self):
+        first = {"user_id": "u1", "points_earned": 5, "display_name": "a"}
+        second = {"user_id": "u1", "points_earned": 5, "display_name": "b"}
+        ranked = compute_rankings([first, second])
+        assert [e["display_name"] for e in ranked] == ["a", "b"]
+
+
+_entry_strategy = st.fixed_dictionaries(
+    {
+        "user_id": st.text(alphabet="abc", min_size=1, max_size=3),
+        "points_earned": st.integers(min_value=0, max_value=10**9),
+        "earliest_achievement": st.none()
+        | st.datetimes(
+            min_value=datetime(2020, 1, 1),
+            max_value=datetime(2030, 1, 1),
+            timezones=st.just(UTC),
+        ),
+        "active_days": st.integers(min_value=0, max_value=400),
+    }
+)
+
+
+@given(entries=st.lists(_entry_strategy, max_size=30))
+@settings(max_examples=100)
+def test_packed_key_matches_tie_break_rules(entries):
+    """The packed sort key orders entries exactly like the field-by-field rules."""
+    never = datetime.max.replace(tzinfo=UTC)
+
+    def reference_key(e):
+        ea = e["earliest_achievement"] or never
+        return (-e["points_earned"], ea, -e["active_days"], e["user_id"])
+
+    expected = [reference_key(e) for e in sorted(entries, key=reference_key)]
+    assert [reference_key(e) for e in compute_rankings(entries)] == expected
+
 
 # ── extract_user_context ───────────────────────────────────────────
 
 
-class TestExtractUserContext:
-    def _make_rankings(self, count: int = 50) -> list[dict[str, Any]]:
-        return [
-            {"user_id": f"u{i}", "rank": i + 1, "points_earned": (count - i) * 10}
-            for i in range(count)
-        ]
+def _make_rankings(count: int) -> tuple[dict[str, Any], ...]:
+    return tuple(
+        {"user_id": f"u{i}", "rank": i + 1, "points_earned": (count - i) * 10} for i in range(count)
+    )
+
+
+@pytest.fixture(scope="session")
+def rankings_50() -> tuple[dict[str, Any], ...]:
+    """50 pre-ranked entries; extract_user_context only reads them."""
+    return _make_rankings(50)
+
 
-    def test_user_in_middle(self):
-        rankings = self._make_rankings(50)
-        ctx = extract_user_context(rankings, "u25")
+class TestExtractUserContext:
+    def test_user_in_middle(self, rankings_50):
+        ctx = extract_user_context(rankings_50, "u25")
         assert ctx["user_rank"] == 26
         assert ctx["total_participants"] == 50
         assert len(ctx["context"]) == 21  # ±10 around position 25
 
-    def test_user_at_top(self):
-        rankings = self._make_rankings(50)
-        ctx = extract_user_context(rankings, "u0")
+    def test_user_at_top(self, rankings_50):
+        ctx = extract_user_context(rankings_50, "u0")
         assert ctx["user_rank"] == 1
         # Context window: 0 to 10 (11 entries)
         assert len(ctx["context"]) == 11
 
-    def test_user_at_bottom(self):
-        rankings = self._make_rankings(50)
-        ctx = extract_user_context(rankings, "u49")
+    def test_user_at_bottom(self, rankings_50):
+        ctx = extract_user_context(rankings_50, "u49")
         assert ctx["user_rank"] == 50
         # Context window: 39 to 49 (11 entries)
         assert len(ctx["context"]) == 11
 
     def test_user_not_found(self):
-        rankings = self._make_rankings(10)
+        rankings = _make_rankings(10)
         ctx = extract_user_context(rankings, "nonexistent")
         assert ctx["user_rank"] is None
         assert ctx["user_entry"] is None
         assert ctx["context"] == []
 
     def test_small_leaderboard(self):
-        rankings = self._make_rankings(3)
+        rankings = _make_rankings(3)
         ctx = extract_user_context(rankings, "u1")
         assert ctx["user_rank"] == 2
         assert len(ctx["context"]) == 3  # All entries in window
 
-    def test_custom_window(self):
-        rankings = self._make_rankings(50)
-        ctx = extract_user_context(rankings, "u25", window=5)
+    def test_custom_window(self, rankings_50):
+        ctx = extract_user_context(rankings_50, "u25", window=5)
         assert len(ctx["context"]) == 11  # ±5
 
 
@@ -255,77 +317,111 @@ class TestExtractUserContext:
 
 
 class MockRepo:
-    def __init__(self, data: list[dict[str, Any]] | None = None) -> None:
+    """In-memory repo indexed by user_id and tier_code (data is fixed at init)."""
+
+    def __init__(self, data: Sequence[dict[str, Any]] | None = None) -> None:
         self.data = data or []
+        self._by_user: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._by_tier: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for d in self.data:
+            self._by_user[d.get("user_id")].append(d)
+            self._by_tier[d.get("tier_code")].append(d)
+        # Per-user rows ordered by start_time, as the real query returns them
+        self._timed: dict[str, tuple[list[datetime], list[dict[str, Any]]]] = {}
+        for user_id, rows in self._by_user.items():
+            timed = sorted((r for r in rows if "start_time" in r), key=itemgetter("start_time"))
+            self._timed[user_id] = ([r["start_time"] for r in timed], timed)
 
     def find_by_user_id(self, user_id: str) -> list[dict[str, Any]]:
-        return [d for d in self.data if d.get("user_id") == user_id]
+        return self._by_user.get(user_id, [])
 
     def find_by_tier_code(self, tier_code: str) -> list[dict[str, Any]]:
-        return [d for d in self.data if d.get("tier_code") == tier_code]
+        return self._by_tier.get(tier_code, [])
 
     def find_all(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
-        return self.data[offset : offset + limit]
+        return list(self.data[offset : offset + limit])
 
     def find_by_user_and_date_range(
         self, user_id: str, start: datetime, end: datetime
     ) -> list[dict[str, Any]]:
-        return [d for d in self.data if d.get("user_id") == user_id]
+        """Rows with ``start <= start_time < end``, located by bisection."""
+        times, rows = self._timed.get(user_id, ([], []))
+        return rows[bisect_left(times, start) : bisect_left(times, end)]
 
 
 class MockCache:
-    def __init__(self) -> None:
-        self._store: dict[str, Any] = {}
+    """Dict-backed cache; *max_entries* adds Redis-style LRU eviction."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self._store: OrderedDict[str, Any] = OrderedDict()
+        self._max = max_entries
 
     def get(self, key: str) -> Any:
+        if key in self._store:
+            self._store.move_to_end(key)
         return self._store.get(key)
 
     def set(self, key: str, value: Any, ttl: int = 900) -> bool:
-        self._store[key] = value
+        return self.set_many({key: value}, ttl)
+
+    def set_many(self, mapping: dict[str, Any], ttl: int = 900) -> bool:
+        self._store.update(mapping)
+        for key in mapping:
+            self._store.move_to_end(key)
+        if self._max is not None:
+            while len(self._store) > self._max:
+                self._store.popitem(last=False)
         return True
 
     def delete(self, key: str) -> bool:
         return self._store.pop(key, None) is not None
 
     def delete_pattern(self, pattern: str) -> int:
-        import fnmatch
-
-        keys = [k for k in self._store if fnmatch.fnmatch(k, pattern)]
+        prefix = pattern[:-1]
+        if pattern.endswith("*") and not any(c in prefix for c in "*?["):
+            keys = [k for k in self._store if k.startswith(prefix)]
+        else:
+            keys = [k for k in self._store if fnmatch.fnmatch(k, pattern)]
         for k in keys:
             del self._store[k]
         return len(keys)
 
 
-def _make_profiles(n: int = 5, tier: str = "M-18-29-BEG") -> list[dict[str, Any]]:
-    return [
+@lru_cache(maxsize=32)
+def _make_profiles(n: int = 5, tier: str = "M-18-29-BEG") -> tuple[dict[str, Any], ...]:
+    """Shared read-only profiles; the service never mutates them."""
+    return tuple(
         {
             "user_id": f"u{i}",
             "display_name": f"User {i}",
             "tier_code": tier,
         }
         for i in range(n)
-    ]
+    )
 
 
-def _make_transactions(
-    user_id: str,
-    amount: int,
-    created_at: datetime | None = None,
-) -> list[dict[str, Any]]:
-    return [
-        {
-            "user_id": user_id,
-            "transaction_type": "earn",
-            "amount": amount,
-            "created_at": created_at or datetime.now(tz=UTC),
-        }
-    ]
+def _tx(user_id: str, amount: int, created_at: datetime) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "transaction_type": "earn",
+        "amount": amount,
+        "created_at": created_at,
+    }
+
+
+def _make_transactions(user_id: str, amount: int, created_at: datetime) -> list[dict[str, Any]]:
+    return [_tx(user_id, amount, created_at)]
+
+
+@pytest.fixture(scope="class")
+def period_start() -> datetime:
+    return get_period_start("daily", _NOW)
 
 
 class TestLeaderboardService:
     def _make_service(
         self,
-        profiles: list[dict[str, Any]] | None = None,
+        profiles: Sequence[dict[str, Any]] | None = None,
         transactions: list[dict[str, Any]] | None = None,
         activities: list[dict[str, Any]] | None = None,
         cache: MockCache | None = None,
@@ -348,12 +444,9 @@ class TestLeaderboardService:
         assert result["items"] == []
         assert result["pagination"]["total_items"] == 0
 
-    def test_get_leaderboard_with_data(self):
+    def test_get_leaderboard_with_data(self, period_start: datetime):
         profiles = _make_profiles(3)
         # Use period start to ensure transactions fall within the daily boundary
-        from fittrack.services.leaderboard import get_period_start
-
-        period_start = get_period_start("daily")
         txns = [
             *_make_transactions("u0", 100, period_start + timedelta(minutes=1)),
             *_make_transactions("u1", 300, period_start + timedelta(minutes=2)),
@@ -380,10 +473,7 @@ class TestLeaderboardService:
 
     def test_get_leaderboard_pagination(self):
         profiles = _make_profiles(10)
-        now = datetime.now(tz=UTC)
-        txns = []
-        for i in range(10):
-            txns.extend(_make_transactions(f"u{i}", (i + 1) * 10, now))
+        txns = [_tx(f"u{i}", (i + 1) * 10, _NOW) for i in range(10)]
         service = self._make_service(profiles=profiles, transactions=txns)
         result = service.get_leaderboard("daily", "M-18-29-BEG", page=1, limit=5)
         assert len(result["items"]) == 5
@@ -391,10 +481,7 @@ class TestLeaderboardService:
 
     def test_get_user_rank(self):
         profiles = _make_profiles(5)
-        now = datetime.now(tz=UTC)
-        txns = []
-        for i in range(5):
-            txns.extend(_make_transactions(f"u{i}", (i + 1) * 50, now))
+        txns = [_tx(f"u{i}", (i + 1) * 50, _NOW) for i in range(5)]
         service = self._make_service(profiles=profiles, transactions=txns)
         result = service.get_user_rank("u2", "daily", "M-18-29-BEG")
         assert result["user_rank"] is not None
@@ -425,6 +512,28 @@ class TestLeaderboardService:
         assert count == 2
         assert "other_key" in cache._store  # Not a leaderboard key
 
+    def test_bounded_cache_evicts_least_recently_used(self):
+        cache = MockCache(max_entries=2)
+        service = self._make_service(cache=cache)
+        service.get_leaderboard("daily", "M-18-29-BEG")
+        service.get_leaderboard("weekly", "M-18-29-BEG")
+        service.get_leaderboard("daily", "M-18-29-BEG")  # refresh daily
+        service.get_leaderboard("monthly", "M-18-29-BEG")
+        assert list(cache._store) == [
+            "leaderboard:daily:M-18-29-BEG",
+            "leaderboard:monthly:M-18-29-BEG",
+        ]
+
+    def test_cache_keys_are_interned(self):
+        cache = MockCache()
+        service = self._make_service(cache=cache)
+        service.get_leaderboard("daily", "M-18-29-BEG")
+        service.get_leaderboard("weekly", None)
+        (tier_key,) = [k for k in cache._store if k.endswith("M-18-29-BEG")]
+        (global_key,) = [k for k in cache._store if k.endswith("global")]
+        assert tier_key is sys.intern("leaderboard:daily:M-18-29-BEG")
+        assert global_key is sys.intern("leaderboard:weekly:global")
+
     def test_invalidate_no_cache(self):
         service = self._make_service()
         assert service.invalidate_cache() == 0
@@ -438,7 +547,7 @@ class TestLeaderboardService:
 
     def test_daily_excludes_old_transactions(self):
         profiles = _make_profiles(1)
-        yesterday_txn = _make_transactions("u0", 500, datetime.now(tz=UTC) - timedelta(days=2))
+        yesterday_txn = _make_transactions("u0", 500, datetime(2026, 1, 13, 12, 0, tzinfo=UTC))
         service = self._make_service(profiles=profiles, transactions=yesterday_txn)
         result = service.get_leaderboard("daily", "M-18-29-BEG")
         # Old transaction should not count in daily
@@ -449,31 +558,41 @@ class TestLeaderboardService:
             {"user_id": "u0", "display_name": "A", "tier_code": "M-18-29-BEG"},
             {"user_id": "u1", "display_name": "B", "tier_code": "F-30-39-INT"},
         ]
-        now = datetime.now(tz=UTC)
-        txns = [
-            *_make_transactions("u0", 100, now),
-            *_make_transactions("u1", 200, now),
-        ]
+        txns = [_tx("u0", 100, _NOW), _tx("u1", 200, _NOW)]
         service = self._make_service(profiles=profiles, transactions=txns)
         result = service.get_leaderboard("daily", tier_code=None)
         assert len(result["items"]) == 2  # Both tiers included
 
     def test_count_active_days(self):
         profiles = _make_profiles(1)
-        now = datetime.now(tz=UTC)
         activities = [
             {
                 "user_id": "u0",
-                "start_time": now - timedelta(hours=2),
+                "start_time": _NOW - timedelta(hours=2),
                 "duration_minutes": 45,
             },
             {
                 "user_id": "u0",
-                "start_time": now - timedelta(days=1, hours=2),
+                "start_time": _NOW - timedelta(days=1, hours=2),
                 "duration_minutes": 35,
             },
         ]
-        txns = _make_transactions("u0", 100, now)
+        txns = _make_transactions("u0", 100, _NOW)
         service = self._make_service(profiles=profiles, transactions=txns, activities=activities)
         result = service.get_leaderboard("weekly", "M-18-29-BEG")
         assert result["items"][0]["active_days"] == 2
+
+    def test_active_days_ignore_activity_before_period(self, period_start: datetime):
+        profiles = _make_profiles(1)
+        activities = [
+            {"user_id": "u0", "start_time": period_start, "duration_minutes": 45},
+            {
+                "user_id": "u0",
+                "start_time": period_start - timedelta(days=1),
+                "duration_minutes": 45,
+            },
+        ]
+        txns = _make_transactions("u0", 100, period_start)
+        service = self._make_service(profiles=profiles, transactions=txns, activities=activities)
+        result = service.get_leaderboard("daily", "M-18-29-BEG")
+        assert result["items"][0]["active_days"] == 1
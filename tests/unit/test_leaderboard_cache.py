@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
+from decimal import Decimal
 from unittest.mock import MagicMock
 
 import pytest
@@ -11,57 +13,66 @@ from fittrack.services.cache import CacheService
 # ── In-memory fallback (no Redis) ──────────────────────────────────
 
 
+@pytest.fixture(scope="class")
+def _memory_cache() -> CacheService:
+    return CacheService()
+
+
+@pytest.fixture
+def cache(_memory_cache: CacheService) -> CacheService:
+    """One in-memory CacheService per class, emptied before each test."""
+    _memory_cache.flush()
+    return _memory_cache
+
+
 class TestCacheServiceInMemory:
     """CacheService with redis_client=None falls back to dict-based store."""
 
-    def test_is_not_redis(self):
-        cache = CacheService()
+    def test_is_not_redis(self, cache: CacheService):
         assert cache.is_redis is False
 
-    def test_get_miss_returns_none(self):
-        cache = CacheService()
+    def test_get_miss_returns_none(self, cache: CacheService):
         assert cache.get("nonexistent") is None
 
-    def test_set_and_get(self):
-        cache = CacheService()
+    def test_set_and_get(self, cache: CacheService):
         assert cache.set("key1", {"data": 42})
         assert cache.get("key1") == {"data": 42}
 
-    def test_set_overwrites(self):
-        cache = CacheService()
+    def test_set_stores_reference_without_serializing(self, cache: CacheService):
+        rankings = [{"user_id": "u1", "rank": 1}]
+        cache.set("key1", rankings)
+        cache.set_many({"key2": rankings})
+        assert cache.get("key1") is rankings
+        assert cache.get("key2") is rankings
+
+    def test_set_overwrites(self, cache: CacheService):
         cache.set("key1", "v1")
         cache.set("key1", "v2")
         assert cache.get("key1") == "v2"
 
-    def test_delete_existing_key(self):
-        cache = CacheService()
+    def test_delete_existing_key(self, cache: CacheService):
         cache.set("key1", "value")
         assert cache.delete("key1") is True
         assert cache.get("key1") is None
 
-    def test_delete_missing_key(self):
-        cache = CacheService()
+    def test_delete_missing_key(self, cache: CacheService):
         assert cache.delete("nope") is False
 
-    def test_exists_true(self):
-        cache = CacheService()
+    def test_exists_true(self, cache: CacheService):
         cache.set("key1", 1)
         assert cache.exists("key1") is True
 
-    def test_exists_false(self):
-        cache = CacheService()
+    def test_exists_false(self, cache: CacheService):
         assert cache.exists("nope") is False
 
-    def test_flush_clears_all(self):
-        cache = CacheService()
+    def test_flush_clears_all(self, cache: CacheService):
         cache.set("a", 1)
         cache.set("b", 2)
         cache.flush()
         assert cache.get("a") is None
         assert cache.get("b") is None
 
-    def test_delete_pattern_trailing_star(self):
-        cache = CacheService()
+    def test_delete_pattern_trailing_star(self, cache: CacheService):
         cache.set("leaderboard:daily:M-18-29-BEG", [1])
         cache.set("leaderboard:weekly:M-18-29-BEG", [2])
         cache.set("other:key", [3])
@@ -69,14 +80,25 @@ class TestCacheServiceInMemory:
         assert count == 2
         assert cache.get("other:key") == [3]
 
-    def test_delete_pattern_no_match(self):
-        cache = CacheService()
+    def test_delete_pattern_inner_wildcard(self, cache: CacheService):
+        cache.set("leaderboard:daily:M-18-29-BEG", [1])
+        cache.set("leaderboard:weekly:M-18-29-BEG", [2])
+        cache.set("leaderboard:daily:global", [3])
+        count = cache.delete_pattern("leaderboard:*:M-18-29-BEG")
+        assert count == 2
+        assert cache.get("leaderboard:daily:global") == [3]
+
+    def test_delete_pattern_no_match(self, cache: CacheService):
         cache.set("a", 1)
         count = cache.delete_pattern("zzz:*")
         assert count == 0
 
-    def test_set_returns_true(self):
-        cache = CacheService()
+    def test_set_many(self, cache: CacheService):
+        assert cache.set_many({"a": 1, "b": [2]}) is True
+        assert cache.get("a") == 1
+        assert cache.get("b") == [2]
+
+    def test_set_returns_true(self, cache: CacheService):
         assert cache.set("k", "v") is True
 
 
@@ -84,26 +106,22 @@ class TestCacheServiceInMemory:
 
 
 class TestCacheLeaderboardConvenience:
-    def test_set_and_get_leaderboard(self):
-        cache = CacheService()
+    def test_set_and_get_leaderboard(self, cache: CacheService):
         rankings = [{"user_id": "u1", "rank": 1, "points_earned": 100}]
         cache.set_leaderboard("daily", "M-18-29-BEG", rankings)
         result = cache.get_leaderboard("daily", "M-18-29-BEG")
         assert result == rankings
 
-    def test_get_leaderboard_miss(self):
-        cache = CacheService()
+    def test_get_leaderboard_miss(self, cache: CacheService):
         assert cache.get_leaderboard("daily", "M-18-29-BEG") is None
 
-    def test_global_leaderboard(self):
-        cache = CacheService()
+    def test_global_leaderboard(self, cache: CacheService):
         rankings = [{"user_id": "u1"}]
         cache.set_leaderboard("weekly", None, rankings)
         assert cache.get_leaderboard("weekly", None) == rankings
         assert cache.exists("leaderboard:weekly:global")
 
-    def test_invalidate_leaderboards(self):
-        cache = CacheService()
+    def test_invalidate_leaderboards(self, cache: CacheService):
         cache.set_leaderboard("daily", "M-18-29-BEG", [])
         cache.set_leaderboard("weekly", "F-30-39-INT", [])
         cache.set("user:123", "data")
@@ -111,8 +129,7 @@ class TestCacheLeaderboardConvenience:
         assert count == 2
         assert cache.exists("user:123")
 
-    def test_custom_ttl(self):
-        cache = CacheService()
+    def test_custom_ttl(self, cache: CacheService):
         # In-memory doesn't enforce TTL, but method should accept it
         assert cache.set_leaderboard("daily", "M-18-29-BEG", [], ttl=60) is True
 
@@ -143,6 +160,11 @@ class TestCacheServiceRedis:
         mock_redis.get.assert_called_once_with("key1")
         assert result == {"k": 1}
 
+    def test_get_decodes_bytes(self, cache: CacheService, mock_redis: MagicMock):
+        # redis-py returns bytes unless the client sets decode_responses=True
+        mock_redis.get.return_value = b'{"k": 1}'
+        assert cache.get("key1") == {"k": 1}
+
     def test_get_miss(self, cache: CacheService, mock_redis: MagicMock):
         mock_redis.get.return_value = None
         assert cache.get("miss") is None
@@ -158,11 +180,30 @@ class TestCacheServiceRedis:
         args = mock_redis.setex.call_args
         assert args[0][0] == "key"
         assert args[0][1] == 600
+        assert args[0][2] == b'{"a":1}'
+
+    def test_set_serializes_datetime_and_decimal(self, cache: CacheService, mock_redis: MagicMock):
+        when = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+        cache.set("key", {"at": when, "pts": Decimal("12.5")})
+        payload = mock_redis.setex.call_args[0][2]
+        assert payload == b'{"at":"2026-01-02T03:04:05+00:00","pts":"12.5"}'
 
     def test_set_handles_error(self, cache: CacheService, mock_redis: MagicMock):
         mock_redis.setex.side_effect = ConnectionError("redis down")
         assert cache.set("key", "val") is False
 
+    def test_set_many_uses_one_pipeline(self, cache: CacheService, mock_redis: MagicMock):
+        pipe = mock_redis.pipeline.return_value.__enter__.return_value
+        assert cache.set_many({"k1": [1], "k2": [2]}, ttl=300) is True
+        mock_redis.pipeline.assert_called_once()
+        assert [c.args[:2] for c in pipe.setex.call_args_list] == [("k1", 300), ("k2", 300)]
+        pipe.execute.assert_called_once()
+        mock_redis.setex.assert_not_called()
+
+    def test_set_many_handles_error(self, cache: CacheService, mock_redis: MagicMock):
+        mock_redis.pipeline.side_effect = ConnectionError("redis down")
+        assert cache.set_many({"k": 1}) is False
+
     def test_delete_calls_redis(self, cache: CacheService, mock_redis: MagicMock):
         mock_redis.delete.return_value = 1
         assert cache.delete("key") is True
@@ -195,6 +236,22 @@ class TestCacheServiceRedis:
         assert count == 1
         mock_redis.scan.assert_called_once()
 
+    def test_delete_pattern_batches_deletes_across_pages(
+        self, cache: CacheService, mock_redis: MagicMock
+    ):
+        pages = [(7, [f"k{i}".encode() for i in range(300)])] * 3
+        pages.append((0, [b"last"]))
+        mock_redis.scan.side_effect = pages
+        mock_redis.delete.side_effect = lambda *keys: len(keys)
+        assert cache.delete_pattern("k*") == 901
+        assert [len(c.args) for c in mock_redis.delete.call_args_list] == [500, 401]
+        assert mock_redis.scan.call_args.kwargs["count"] == 1000
+
+    def test_delete_pattern_no_keys_skips_delete(self, cache: CacheService, mock_redis: MagicMock):
+        mock_redis.scan.return_value = (0, [])
+        assert cache.delete_pattern("leaderboard:*") == 0
+        mock_redis.delete.assert_not_called()
+
     def test_delete_pattern_handles_error(self, cache: CacheService, mock_redis: MagicMock):
         mock_redis.scan.side_effect = ConnectionError("down")
         assert cache.delete_pattern("leaderboard:*") == 0
@@ -2,37 +2,53 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
+import orjson
 import pytest
 
 from fittrack.services.normalizer import (
     NormalizerError,
     detect_duplicate,
+    detect_duplicates_many,
     normalize_activity,
     resolve_multi_tracker_conflict,
 )
 from fittrack.services.providers.base import RawActivity
 
+# Instants on 2026-01-15 (UTC) shared by the tests below
+_T0 = datetime(2026, 1, 15, tzinfo=UTC)
+_T8 = _T0.replace(hour=8)
+_T9 = _T0.replace(hour=9)
+_T23 = _T0.replace(hour=23)
+_T2359 = _T0.replace(hour=23, minute=59)
+_NEXT_DAY = _T0 + timedelta(days=1)
+_NEXT_DAY_2359 = _T2359 + timedelta(days=1)
+# created_at values as stored (naive ISO strings) for conflict resolution
+_RECEIVED_FIRST = "2026-01-15T00:00:00"
+_RECEIVED_LATER = "2026-01-15T01:00:00"
+
 # ── Normalization ───────────────────────────────────────────────────
 
 
-class TestNormalizeActivity:
-    def _make_raw(self, **kwargs):
-        defaults = {
-            "external_id": "ext_001",
-            "provider": "google_fit",
-            "activity_type": "steps",
-            "start_time": datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-            "end_time": datetime(2026, 1, 15, 23, 59, tzinfo=UTC),
-            "metrics": {"step_count": 10000},
-        }
-        defaults.update(kwargs)
-        return RawActivity(**defaults)
+@pytest.fixture(scope="class")
+def base_raw() -> RawActivity:
+    """One step-count activity; tests derive variants with dataclasses.replace."""
+    return RawActivity(
+        external_id="ext_001",
+        provider="google_fit",
+        activity_type="steps",
+        start_time=_T8,
+        end_time=_T2359,
+        metrics={"step_count": 10000},
+    )
 
-    def test_basic_normalization(self):
-        raw = self._make_raw()
-        result = normalize_activity(raw, "user1", "conn1")
+
+class TestNormalizeActivity:
+    def test_basic_normalization(self, base_raw: RawActivity):
+        result = normalize_activity(base_raw, "user1", "conn1")
         assert result["user_id"] == "user1"
         assert result["connection_id"] == "conn1"
         assert result["external_id"] == "ext_001"
@@ -40,8 +56,9 @@ class TestNormalizeActivity:
         assert result["points_earned"] == 0
         assert result["processed"] == 0
 
-    def test_workout_normalization(self):
-        raw = self._make_raw(
+    def test_workout_normalization(self, base_raw: RawActivity):
+        raw = replace(
+            base_raw,
             activity_type="workout",
             duration_minutes=30,
             intensity="moderate",
@@ -52,17 +69,15 @@ class TestNormalizeActivity:
         assert result["duration_minutes"] == 30
         assert result["intensity"] == "moderate"
 
-    def test_metrics_serialized_as_json(self):
-        raw = self._make_raw(metrics={"step_count": 5000, "distance_km": 3.5})
+    def test_metrics_serialized_as_json(self, base_raw: RawActivity):
+        raw = replace(base_raw, metrics={"step_count": 5000, "distance_km": 3.5})
         result = normalize_activity(raw, "user1", "conn1")
-        import json
-
-        parsed = json.loads(result["metrics"])
+        parsed = orjson.loads(result["metrics"])
         assert parsed["step_count"] == 5000
         assert parsed["distance_km"] == 3.5
 
-    def test_empty_metrics(self):
-        raw = self._make_raw(metrics={})
+    def test_empty_metrics(self, base_raw: RawActivity):
+        raw = replace(base_raw, metrics={})
         result = normalize_activity(raw, "user1", "conn1")
         assert result["metrics"] == "{}"
 
@@ -70,143 +85,137 @@ class TestNormalizeActivity:
 # ── Duplicate Detection ────────────────────────────────────────────
 
 
-class TestDetectDuplicate:
-    def test_no_existing_no_duplicate(self):
-        raw = RawActivity(
-            external_id="ext_001",
-            provider="google_fit",
-            activity_type="steps",
-            start_time=datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-        )
-        assert detect_duplicate(raw, "user1", []) is None
-
-    def test_same_external_id_is_duplicate(self):
-        raw = RawActivity(
-            external_id="ext_001",
-            provider="google_fit",
-            activity_type="steps",
-            start_time=datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-        )
-        existing = [{"activity_id": "act1", "external_id": "ext_001", "user_id": "user1"}]
-        assert detect_duplicate(raw, "user1", existing) == "act1"
-
-    def test_different_external_id_not_duplicate(self):
-        raw = RawActivity(
-            external_id="ext_002",
-            provider="google_fit",
-            activity_type="steps",
-            start_time=datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-        )
-        existing = [{"activity_id": "act1", "external_id": "ext_001", "user_id": "user1"}]
-        assert detect_duplicate(raw, "user1", existing) is None
-
-    def test_same_type_overlapping_time_is_duplicate(self):
-        raw = RawActivity(
-            external_id="ext_new",
-            provider="fitbit",
-            activity_type="steps",
-            start_time=datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-            end_time=datetime(2026, 1, 15, 23, 59, tzinfo=UTC),
-        )
-        existing = [
-            {
-                "activity_id": "act1",
-                "external_id": "ext_old",
-                "user_id": "user1",
-                "activity_type": "steps",
-                "start_time": datetime(2026, 1, 15, 0, 0, tzinfo=UTC),
-                "end_time": datetime(2026, 1, 15, 23, 59, tzinfo=UTC),
-            }
-        ]
-        assert detect_duplicate(raw, "user1", existing) == "act1"
-
-    def test_same_type_non_overlapping(self):
-        raw = RawActivity(
-            external_id="ext_new",
-            provider="fitbit",
-            activity_type="steps",
-            start_time=datetime(2026, 1, 16, 0, 0, tzinfo=UTC),
-            end_time=datetime(2026, 1, 16, 23, 59, tzinfo=UTC),
-        )
-        existing = [
-            {
-                "activity_id": "act1",
-                "external_id": "ext_old",
-                "user_id": "user1",
-                "activity_type": "steps",
-                "start_time": datetime(2026, 1, 15, 0, 0, tzinfo=UTC),
-                "end_time": datetime(2026, 1, 15, 23, 59, tzinfo=UTC),
-            }
-        ]
-        assert detect_duplicate(raw, "user1", existing) is None
-
-    def test_different_user_not_duplicate(self):
-        raw = RawActivity(
-            external_id="ext_001",
-            provider="google_fit",
-            activity_type="steps",
-            start_time=datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-        )
-        existing = [{"activity_id": "act1", "external_id": "ext_001", "user_id": "user2"}]
-        assert detect_duplicate(raw, "user1", existing) is None
+_BASE_RAW = {
+    "external_id": "ext_001",
+    "provider": "google_fit",
+    "activity_type": "steps",
+    "start_time": _T8,
+}
+_FITBIT_NEW = {"external_id": "ext_new", "provider": "fitbit"}
+# Every existing row in the cases below is a variant of this one
+_DAY_OF_STEPS = {
+    "activity_id": "act1",
+    "external_id": "ext_old",
+    "user_id": "user1",
+    "activity_type": "steps",
+    "start_time": _T0,
+    "end_time": _T2359,
+}
+_SAME_EXT_ID = {**_DAY_OF_STEPS, "external_id": "ext_001"}
 
-    def test_different_type_not_duplicate(self):
-        raw = RawActivity(
-            external_id="ext_new",
-            provider="fitbit",
-            activity_type="workout",
-            start_time=datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-            end_time=datetime(2026, 1, 15, 9, 0, tzinfo=UTC),
-        )
-        existing = [
-            {
-                "activity_id": "act1",
-                "external_id": "ext_old",
-                "user_id": "user1",
-                "activity_type": "steps",
-                "start_time": datetime(2026, 1, 15, 0, 0, tzinfo=UTC),
-                "end_time": datetime(2026, 1, 15, 23, 59, tzinfo=UTC),
-            }
-        ]
-        assert detect_duplicate(raw, "user1", existing) is None
 
-    def test_no_end_time_same_start_is_duplicate(self):
-        raw = RawActivity(
-            external_id="ext_new",
-            provider="fitbit",
-            activity_type="steps",
-            start_time=datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-        )
-        existing = [
-            {
-                "activity_id": "act1",
-                "external_id": "ext_old",
-                "user_id": "user1",
-                "activity_type": "steps",
-                "start_time": datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-            }
-        ]
-        assert detect_duplicate(raw, "user1", existing) == "act1"
-
-    def test_string_timestamps_handled(self):
-        raw = RawActivity(
-            external_id="ext_new",
-            provider="fitbit",
-            activity_type="steps",
-            start_time=datetime(2026, 1, 15, 8, 0, tzinfo=UTC),
-            end_time=datetime(2026, 1, 15, 23, 0, tzinfo=UTC),
-        )
-        existing = [
-            {
-                "activity_id": "act1",
-                "external_id": "ext_old",
-                "user_id": "user1",
-                "activity_type": "steps",
-                "start_time": "2026-01-15T00:00:00+00:00",
-                "end_time": "2026-01-15T23:59:00+00:00",
-            }
-        ]
-        assert detect_duplicate(raw, "user1", existing) == "act1"
+class TestDetectDuplicate:
+    @pytest.mark.parametrize(
+        ("raw_kwargs", "existing", "expected"),
+        [
+            pytest.param({}, [], None, id="no-existing"),
+            pytest.param({}, [_SAME_EXT_ID], "act1", id="same-external-id"),
+            pytest.param({"external_id": "ext_002"}, [_SAME_EXT_ID], None, id="other-external-id"),
+            pytest.param({}, [{**_SAME_EXT_ID, "user_id": "user2"}], None, id="other-user"),
+            pytest.param(
+                {**_FITBIT_NEW, "end_time": _T2359},
+                [_DAY_OF_STEPS],
+                "act1",
+                id="same-type-overlapping",
+            ),
+            pytest.param(
+                {
+                    **_FITBIT_NEW,
+                    "start_time": _NEXT_DAY,
+                    "end_time": _NEXT_DAY_2359,
+                },
+                [_DAY_OF_STEPS],
+                None,
+                id="same-type-non-overlapping",
+            ),
+            pytest.param(
+                {
+                    **_FITBIT_NEW,
+                    "activity_type": "workout",
+                    "end_time": _T9,
+                },
+                [_DAY_OF_STEPS],
+                None,
+                id="other-type",
+            ),
+            pytest.param(
+                _FITBIT_NEW,
+                [
+                    {
+                        **_DAY_OF_STEPS,
+                        "start_time": _T8,
+                        "end_time": None,
+                    }
+                ],
+                "act1",
+                id="no-end-time-same-start",
+            ),
+            pytest.param(
+                {**_FITBIT_NEW, "end_time": _T23},
+                [
+                    {
+                        **_DAY_OF_STEPS,
+                        "start_time": _T0.isoformat(),
+                        "end_time": _T2359.isoformat(),
+                    }
+                ],
+                "act1",
+                id="string-timestamps",
+            ),
+        ],
+    )
+    def test_detect_duplicate(
+        self,
+        raw_kwargs: dict[str, Any],
+        existing: list[dict[str, Any]],
+        expected: str | None,
+    ):
+        raw = RawActivity(**{**_BASE_RAW, **raw_kwargs})
+        assert detect_duplicate(raw, "user1", existing) == expected
+
+    @pytest.mark.parametrize(
+        ("raws_kwargs", "existing", "expected"),
+        [
+            pytest.param([], [_DAY_OF_STEPS], [], id="empty-batch"),
+            pytest.param(
+                [
+                    {},
+                    {"external_id": "ext_002", "activity_type": "workout"},
+                    {**_FITBIT_NEW, "end_time": _T23},
+                ],
+                [_SAME_EXT_ID],
+                ["act1", None, "act1"],
+                id="mixed-batch",
+            ),
+            pytest.param(
+                [{"end_time": _T9}],
+                [{**_DAY_OF_STEPS, "activity_id": "act0"}, _SAME_EXT_ID],
+                ["act0"],
+                id="earlier-overlap-beats-later-external-id",
+            ),
+            pytest.param(
+                [{"activity_type": "workout", "end_time": _T9}],
+                [{**_SAME_EXT_ID, "user_id": "user2"}, {**_DAY_OF_STEPS, "external_id": "ext_001"}],
+                ["act1"],
+                id="other-user-rows-not-indexed",
+            ),
+            pytest.param(
+                [{"end_time": _T9}],
+                [{**_SAME_EXT_ID, "start_time": "not-a-timestamp"}],
+                ["act1"],
+                id="external-id-row-times-not-parsed",
+            ),
+        ],
+    )
+    def test_detect_duplicates_many(
+        self,
+        raws_kwargs: list[dict[str, Any]],
+        existing: list[dict[str, Any]],
+        expected: list[str | None],
+    ):
+        raws = [RawActivity(**{**_BASE_RAW, **kw}) for kw in raws_kwargs]
+        assert detect_duplicates_many(raws, "user1", existing) == expected
+        assert [detect_duplicate(raw, "user1", existing) for raw in raws] == expected
 
 
 # ── Multi-Tracker Conflict Resolution ──────────────────────────────
@@ -228,13 +237,13 @@ class TestResolveMultiTrackerConflict:
                 "activity_id": "a1",
                 "provider": "fitbit",
                 "metrics": {"step_count": 10000},
-                "created_at": "2026-01-15T00:00:00",
+                "created_at": _RECEIVED_FIRST,
             },
             {
                 "activity_id": "a2",
                 "provider": "google_fit",
                 "metrics": {"step_count": 9000},
-                "created_at": "2026-01-15T01:00:00",
+                "created_at": _RECEIVED_LATER,
             },
         ]
         result = resolve_multi_tracker_conflict(activities, primary_provider="google_fit")
@@ -246,13 +255,13 @@ class TestResolveMultiTrackerConflict:
                 "activity_id": "a1",
                 "provider": "fitbit",
                 "metrics": {"step_count": 10000},
-                "created_at": "2026-01-15T01:00:00",
+                "created_at": _RECEIVED_LATER,
             },
             {
                 "activity_id": "a2",
                 "provider": "google_fit",
                 "metrics": {"step_count": 10000, "distance_km": 5.2, "speed": 4.5},
-                "created_at": "2026-01-15T01:00:00",
+                "created_at": _RECEIVED_LATER,
             },
         ]
         result = resolve_multi_tracker_conflict(activities)
@@ -264,13 +273,13 @@ class TestResolveMultiTrackerConflict:
                 "activity_id": "a1",
                 "provider": "fitbit",
                 "metrics": {"step_count": 10000},
-                "created_at": "2026-01-15T01:00:00",
+                "created_at": _RECEIVED_LATER,
             },
             {
                 "activity_id": "a2",
                 "provider": "google_fit",
                 "metrics": {"step_count": 10000},
-                "created_at": "2026-01-15T00:00:00",
+                "created_at": _RECEIVED_FIRST,
             },
         ]
         result = resolve_multi_tracker_conflict(activities)
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from fittrack.core.constants import NOTIFICATION_TYPES as CONST_NOTIFICATION_TYPES
 from fittrack.services.notifications import (
     EMAIL_TEMPLATES,
     NOTIFICATION_TYPES,
@@ -17,33 +18,51 @@ from fittrack.services.notifications import (
 # ── Helpers ──────────────────────────────────────────────────────────
 
 
+class MockNotificationRepo:
+    """Plain repo double: serves fixed rows and records writes."""
+
+    def __init__(self, items: list[dict[str, Any]] | None = None) -> None:
+        self.items = items or []
+        self._by_id = {n.get("notification_id"): n for n in self.items}
+        self.created: list[dict[str, Any]] = []
+        self.updated: list[tuple[str, dict[str, Any]]] = []
+
+    def find_by_id(self, notification_id: str) -> dict[str, Any] | None:
+        return self._by_id.get(notification_id)
+
+    def find_all(self, **kwargs: Any) -> list[dict[str, Any]]:
+        return self.items
+
+    def count(self, **kwargs: Any) -> int:
+        return len(self.items)
+
+    def create(self, data: dict[str, Any], new_id: str) -> None:
+        self.created.append({"notification_id": new_id, **data})
+
+    def update(self, notification_id: str, data: dict[str, Any]) -> int:
+        self.updated.append((notification_id, data))
+        return 1
+
+
 def _make_service(
     *,
     notifications: list[dict[str, Any]] | None = None,
     email_service: Any | None = None,
 ) -> NotificationService:
     """Create a NotificationService with mock repo."""
-    repo = MagicMock()
-
-    if notifications:
-        repo.find_by_id.side_effect = lambda nid: next(
-            (n for n in notifications if n.get("notification_id") == nid),
-            None,
-        )
-        repo.find_all.return_value = notifications
-        repo.count.return_value = len(notifications)
-    else:
-        repo.find_by_id.return_value = None
-        repo.find_all.return_value = []
-        repo.count.return_value = 0
-
     return NotificationService(
-        notification_repo=repo,
+        notification_repo=MockNotificationRepo(notifications),
         email_service=email_service,
         dev_mode=True,
     )
 
 
+@pytest.fixture(scope="module")
+def ro_service() -> NotificationService:
+    """One service for tests that never inspect the repo's recorded calls."""
+    return _make_service()
+
+
 # ── Create Notification Tests ────────────────────────────────────────
 
 
@@ -62,7 +81,7 @@ class TestCreateNotification:
         assert result["user_id"] == "u1"
         assert result["title"] == "Hello"
         assert result["is_read"] == 0
-        svc.notification_repo.create.assert_called_once()
+        assert len(svc.notification_repo.created) == 1
 
     def test_create_with_email(self) -> None:
         email_svc = MagicMock()
@@ -89,19 +108,17 @@ class TestCreateNotification:
         )
         email_svc._send.assert_not_called()
 
-    def test_invalid_type(self) -> None:
-        svc = _make_service()
+    def test_invalid_type(self, ro_service: NotificationService) -> None:
         with pytest.raises(NotificationError, match="Invalid type"):
-            svc.create_notification(
+            ro_service.create_notification(
                 user_id="u1",
                 notification_type="unknown_type",
                 title="Test",
                 message="Body",
             )
 
-    def test_with_metadata(self) -> None:
-        svc = _make_service()
-        result = svc.create_notification(
+    def test_with_metadata(self, ro_service: NotificationService) -> None:
+        result = ro_service.create_notification(
             user_id="u1",
             notification_type="general",
             title="Test",
@@ -117,9 +134,8 @@ class TestCreateNotification:
 class TestNotificationTriggers:
     """Test specific notification trigger methods."""
 
-    def test_notify_winner(self) -> None:
-        svc = _make_service()
-        result = svc.notify_winner(
+    def test_notify_winner(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_winner(
             user_id="u1",
             email="a@b.com",
             prize_name="iPhone 16",
@@ -129,9 +145,8 @@ class TestNotificationTriggers:
         assert "iPhone 16" in result["message"]
         assert "Daily Draw" in result["message"]
 
-    def test_notify_winner_with_display_name(self) -> None:
-        svc = _make_service()
-        result = svc.notify_winner(
+    def test_notify_winner_with_display_name(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_winner(
             user_id="u1",
             email="a@b.com",
             prize_name="Prize",
@@ -140,9 +155,8 @@ class TestNotificationTriggers:
         )
         assert "John" in result["message"]
 
-    def test_notify_fulfillment_shipped(self) -> None:
-        svc = _make_service()
-        result = svc.notify_fulfillment_update(
+    def test_notify_fulfillment_shipped(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_fulfillment_update(
             user_id="u1",
             email="a@b.com",
             status="shipped",
@@ -153,9 +167,8 @@ class TestNotificationTriggers:
         assert result["notification_type"] == "fulfillment_update"
         assert "shipped" in result["title"].lower()
 
-    def test_notify_fulfillment_delivered(self) -> None:
-        svc = _make_service()
-        result = svc.notify_fulfillment_update(
+    def test_notify_fulfillment_delivered(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_fulfillment_update(
             user_id="u1",
             email="a@b.com",
             status="delivered",
@@ -163,9 +176,8 @@ class TestNotificationTriggers:
         )
         assert "delivered" in result["title"].lower()
 
-    def test_notify_fulfillment_unknown_status(self) -> None:
-        svc = _make_service()
-        result = svc.notify_fulfillment_update(
+    def test_notify_fulfillment_unknown_status(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_fulfillment_update(
             user_id="u1",
             email="a@b.com",
             status="pending",
@@ -173,9 +185,8 @@ class TestNotificationTriggers:
         )
         assert result["notification_type"] == "fulfillment_update"
 
-    def test_notify_account_suspended(self) -> None:
-        svc = _make_service()
-        result = svc.notify_account_status_change(
+    def test_notify_account_suspended(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_account_status_change(
             user_id="u1",
             email="a@b.com",
             new_status="suspended",
@@ -184,27 +195,24 @@ class TestNotificationTriggers:
         assert result["notification_type"] == "account_status_change"
         assert "suspended" in result["title"].lower()
 
-    def test_notify_account_activated(self) -> None:
-        svc = _make_service()
-        result = svc.notify_account_status_change(
+    def test_notify_account_activated(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_account_status_change(
             user_id="u1",
             email="a@b.com",
             new_status="active",
         )
         assert "activated" in result["title"].lower()
 
-    def test_notify_account_other_status(self) -> None:
-        svc = _make_service()
-        result = svc.notify_account_status_change(
+    def test_notify_account_other_status(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_account_status_change(
             user_id="u1",
             email="a@b.com",
             new_status="banned",
         )
         assert "banned" in result["title"]
 
-    def test_notify_point_adjustment(self) -> None:
-        svc = _make_service()
-        result = svc.notify_point_adjustment(
+    def test_notify_point_adjustment(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_point_adjustment(
             user_id="u1",
             email="a@b.com",
             amount=500,
@@ -215,9 +223,8 @@ class TestNotificationTriggers:
         assert "+500" in result["message"]
         assert "Bonus reward" in result["message"]
 
-    def test_notify_point_deduction(self) -> None:
-        svc = _make_service()
-        result = svc.notify_point_adjustment(
+    def test_notify_point_deduction(self, ro_service: NotificationService) -> None:
+        result = ro_service.notify_point_adjustment(
             user_id="u1",
             email="a@b.com",
             amount=-200,
@@ -244,7 +251,7 @@ class TestReadUnread:
         svc = _make_service(notifications=notifications)
         result = svc.mark_as_read("n1", "u1")
         assert result["is_read"] is True
-        svc.notification_repo.update.assert_called_once()
+        assert len(svc.notification_repo.updated) == 1
 
     def test_mark_already_read(self) -> None:
         notifications = [
@@ -257,12 +264,11 @@ class TestReadUnread:
         svc = _make_service(notifications=notifications)
         result = svc.mark_as_read("n1", "u1")
         assert result["already_read"] is True
-        svc.notification_repo.update.assert_not_called()
+        assert svc.notification_repo.updated == []
 
-    def test_mark_not_found(self) -> None:
-        svc = _make_service()
+    def test_mark_not_found(self, ro_service: NotificationService) -> None:
         with pytest.raises(NotificationError, match="not found"):
-            svc.mark_as_read("n999", "u1")
+            ro_service.mark_as_read("n999", "u1")
 
     def test_mark_wrong_user(self) -> None:
         notifications = [
@@ -277,8 +283,8 @@ class TestReadUnread:
             svc.mark_as_read("n1", "u2")
 
     def test_get_unread_count(self) -> None:
-        svc = _make_service()
-        svc.notification_repo.count.return_value = 5
+        unread = [{"notification_id": f"n{i}", "user_id": "u1", "is_read": 0} for i in range(5)]
+        svc = _make_service(notifications=unread)
         count = svc.get_unread_count("u1")
         assert count == 5
 
@@ -292,9 +298,7 @@ class TestReadUnread:
         assert result["pagination"]["total_items"] == 2
 
     def test_get_user_notifications_unread_only(self) -> None:
-        svc = _make_service()
-        svc.notification_repo.find_all.return_value = [{"notification_id": "n1", "is_read": 0}]
-        svc.notification_repo.count.return_value = 1
+        svc = _make_service(notifications=[{"notification_id": "n1", "is_read": 0}])
         result = svc.get_user_notifications("u1", is_read=False)
         assert result["pagination"]["total_items"] == 1
 
@@ -305,33 +309,33 @@ class TestReadUnread:
 class TestEmailTemplates:
     """Test email template rendering."""
 
-    def test_render_verification(self) -> None:
-        result = NotificationService.render_template(
-            "verification",
-            display_name="John",
-            verification_link="https://example.com/verify",
-        )
-        assert "John" in result["body"]
-        assert "verify" in result["body"].lower()
-
-    def test_render_password_reset(self) -> None:
-        result = NotificationService.render_template(
-            "password_reset",
-            display_name="Jane",
-            reset_link="https://example.com/reset",
-        )
-        assert "Jane" in result["body"]
-        assert "reset" in result["body"].lower()
-
-    def test_render_winner_notification(self) -> None:
-        result = NotificationService.render_template(
-            "winner_notification",
-            display_name="Bob",
-            prize_name="iPhone",
-            drawing_name="Daily Draw",
-        )
-        assert "Bob" in result["body"]
-        assert "iPhone" in result["body"]
+    @pytest.mark.parametrize(
+        ("template", "kwargs", "must_contain"),
+        [
+            (
+                "verification",
+                {"display_name": "John", "verification_link": "https://example.com/verify"},
+                ("John", "verify"),
+            ),
+            (
+                "password_reset",
+                {"display_name": "Jane", "reset_link": "https://example.com/reset"},
+                ("Jane", "reset"),
+            ),
+            (
+                "winner_notification",
+                {"display_name": "Bob", "prize_name": "iPhone", "drawing_name": "Daily Draw"},
+                ("Bob", "iPhone"),
+            ),
+        ],
+        ids=["verification", "password_reset", "winner_notification"],
+    )
+    def test_render(
+        self, template: str, kwargs: dict[str, str], must_contain: tuple[str, ...]
+    ) -> None:
+        body = NotificationService.render_template(template, **kwargs)["body"]
+        for text in must_contain:
+            assert text in body
 
     def test_render_unknown_template(self) -> None:
         with pytest.raises(NotificationError, match="Unknown template"):
@@ -359,10 +363,9 @@ class TestGetNotification:
         result = svc.get_notification("n1")
         assert result["title"] == "Hi"
 
-    def test_get_not_found(self) -> None:
-        svc = _make_service()
+    def test_get_not_found(self, ro_service: NotificationService) -> None:
         with pytest.raises(NotificationError, match="not found"):
-            svc.get_notification("n999")
+            ro_service.get_notification("n999")
 
 
 # ── Notification Types Completeness ──────────────────────────────────
@@ -371,20 +374,15 @@ class TestGetNotification:
 class TestNotificationTypes:
     """Test notification type constants."""
 
-    def test_all_types_valid(self) -> None:
-        svc = _make_service()
-        for ntype in NOTIFICATION_TYPES:
-            result = svc.create_notification(
-                user_id="u1",
-                notification_type=ntype,
-                title=f"Test {ntype}",
-                message="body",
-            )
-            assert result["notification_type"] == ntype
-
-    def test_types_match_constants(self) -> None:
-        from fittrack.core.constants import (
-            NOTIFICATION_TYPES as CONST_TYPES,
+    @pytest.mark.parametrize("ntype", NOTIFICATION_TYPES)
+    def test_type_valid(self, ro_service: NotificationService, ntype: str) -> None:
+        result = ro_service.create_notification(
+            user_id="u1",
+            notification_type=ntype,
+            title=f"Test {ntype}",
+            message="body",
         )
+        assert result["notification_type"] == ntype
 
-        assert set(NOTIFICATION_TYPES) == set(CONST_TYPES)
+    def test_types_match_constants(self) -> None:
+        assert frozenset(NOTIFICATION_TYPES) == frozenset(CONST_NOTIFICATION_TYPES)
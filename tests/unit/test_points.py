@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
 import pytest
 
 from fittrack.services.points import (
@@ -164,6 +168,13 @@ class TestWeeklyStreakBonus:
         days = [True, True, True, True, True, True, True, False]
         assert calculate_weekly_streak_bonus(days) == 0
 
+    @pytest.mark.parametrize(
+        ("mask", "expected"),
+        [(0b1111111, 250), (0b110_1111111, 250), (0b1111110, 0), (0b111111, 0), (0, 0)],
+    )
+    def test_bitmask_checks_low_seven_bits(self, mask: int, expected: int):
+        assert calculate_weekly_streak_bonus(mask) == expected
+
 
 # ── Daily Cap ───────────────────────────────────────────────────────
 
@@ -273,6 +284,10 @@ class TestCalculateActivityPoints:
         }
         assert calculate_activity_points(activity) == 50
 
+    def test_malformed_metrics_string_earns_nothing(self):
+        activity = {"activity_type": "steps", "metrics": "{not json"}
+        assert calculate_activity_points(activity) == 0
+
     def test_unknown_activity_type(self):
         activity = {"activity_type": "swimming", "metrics": {}}
         assert calculate_activity_points(activity) == 0
@@ -282,21 +297,39 @@ class TestCalculateActivityPoints:
 
 
 class MockRepo:
-    """Minimal mock repo for testing PointsService."""
+    """Minimal mock repo for testing PointsService.
+
+    Rows are indexed by id and user_id up front, and by any other field on
+    first lookup, so queries are dict hits rather than scans of ``data``.
+    Date-range queries bisect a per-user list sorted by ``start_time``.
+    """
 
     def __init__(self, data=None):
         self.data = data or []
         self.created = []
         self.updated = []
+        self._by_id = {}
+        self._by_field = {}
+        self._by_start = None
+        for item in self.data:
+            # First row wins, matching a front-to-back scan on either key
+            for key in ("user_id", "id"):
+                if key in item:
+                    self._by_id.setdefault(item[key], item)
+
+    def _index(self, field):
+        index = self._by_field.get(field)
+        if index is None:
+            index = self._by_field[field] = defaultdict(list)
+            for item in self.data:
+                index[item.get(field)].append(item)
+        return index
 
     def find_by_id(self, entity_id):
-        for item in self.data:
-            if item.get("user_id") == entity_id or item.get("id") == entity_id:
-                return item
-        return None
+        return self._by_id.get(entity_id)
 
     def find_by_user_id(self, user_id):
-        return [d for d in self.data if d.get("user_id") == user_id]
+        return list(self._index("user_id").get(user_id, ()))
 
     def find_all(self, limit=20, offset=0, filters=None):
         result = self.data
@@ -305,7 +338,14 @@ class MockRepo:
         return result[offset : offset + limit]
 
     def find_by_user_and_date_range(self, user_id, start, end):
-        return [d for d in self.data if d.get("user_id") == user_id]
+        if self._by_start is None:
+            self._by_start = {}
+            for uid, rows in self._index("user_id").items():
+                rows = sorted((r for r in rows if "start_time" in r), key=lambda r: r["start_time"])
+                self._by_start[uid] = ([r["start_time"] for r in rows], rows)
+        times, rows = self._by_start.get(user_id, ((), ()))
+        # Same half-open window as the real query: start <= start_time < end
+        return rows[bisect_left(times, start) : bisect_left(times, end)]
 
     def create(self, data, new_id=None):
         data["id"] = new_id
@@ -317,70 +357,73 @@ class MockRepo:
         return 1
 
     def find_by_field(self, field, value):
-        return [d for d in self.data if d.get(field) == value]
+        return list(self._index(field).get(value, ()))
+
+
+def _make_service(user_data=None, txn_data=None, activity_data=None):
+    if user_data is None:
+        user_data = [{"user_id": "u1", "point_balance": 500}]
+    user_repo = MockRepo(user_data)
+    txn_repo = MockRepo(txn_data or [])
+    activity_repo = MockRepo(activity_data or [])
+    return PointsService(
+        transaction_repo=txn_repo,
+        user_repo=user_repo,
+        activity_repo=activity_repo,
+    )
+
+
+@pytest.fixture(scope="module")
+def default_service():
+    """Default service shared by the tests that never write through it."""
+    return _make_service()
 
 
 class TestPointsService:
-    def _make_service(self, user_data=None, txn_data=None, activity_data=None):
-        if user_data is None:
-            user_data = [{"user_id": "u1", "point_balance": 500}]
-        user_repo = MockRepo(user_data)
-        txn_repo = MockRepo(txn_data or [])
-        activity_repo = MockRepo(activity_data or [])
-        return PointsService(
-            transaction_repo=txn_repo,
-            user_repo=user_repo,
-            activity_repo=activity_repo,
-        )
-
-    def test_get_balance(self):
-        service = self._make_service()
-        assert service.get_balance("u1") == 500
+    def test_get_balance(self, default_service):
+        assert default_service.get_balance("u1") == 500
 
     def test_get_balance_user_not_found(self):
-        service = self._make_service(user_data=[])
+        service = _make_service(user_data=[])
         with pytest.raises(PointsError, match="User not found"):
             service.get_balance("u1")
 
     def test_create_earn_transaction(self):
-        service = self._make_service()
+        service = _make_service()
         result = service.create_earn_transaction("u1", 100, "activity", "a1", "test")
         assert result["amount"] == 100
         assert result["balance_after"] == 600
 
-    def test_create_earn_zero_raises(self):
-        service = self._make_service()
+    def test_create_earn_zero_raises(self, default_service):
         with pytest.raises(PointsError, match="positive"):
-            service.create_earn_transaction("u1", 0)
+            default_service.create_earn_transaction("u1", 0)
 
-    def test_create_earn_negative_raises(self):
-        service = self._make_service()
+    def test_create_earn_negative_raises(self, default_service):
         with pytest.raises(PointsError, match="positive"):
-            service.create_earn_transaction("u1", -10)
+            default_service.create_earn_transaction("u1", -10)
 
     def test_create_spend_transaction(self):
-        service = self._make_service()
+        service = _make_service()
         result = service.create_spend_transaction("u1", 200, "ticket", "t1")
         assert result["amount"] == -200
         assert result["balance_after"] == 300
 
-    def test_create_spend_insufficient_balance(self):
-        service = self._make_service()
+    def test_create_spend_insufficient_balance(self, default_service):
         with pytest.raises(PointsError, match="Insufficient balance"):
-            service.create_spend_transaction("u1", 1000)
+            default_service.create_spend_transaction("u1", 1000)
 
     def test_create_adjust_positive(self):
-        service = self._make_service()
+        service = _make_service()
         result = service.create_adjust_transaction("u1", 200, "admin bonus", "admin1")
         assert result["balance_after"] == 700
 
     def test_create_adjust_negative(self):
-        service = self._make_service()
+        service = _make_service()
         result = service.create_adjust_transaction("u1", -200, "penalty", "admin1")
         assert result["balance_after"] == 300
 
     def test_create_adjust_floors_at_zero(self):
-        service = self._make_service()
+        service = _make_service()
         result = service.create_adjust_transaction("u1", -1000, "big penalty")
         assert result["balance_after"] == 0
 
@@ -390,11 +433,11 @@ class TestPointsService:
             {"user_id": "u1", "transaction_type": "earn", "amount": 200},
             {"user_id": "u1", "transaction_type": "spend", "amount": -50},
         ]
-        service = self._make_service(txn_data=txns)
+        service = _make_service(txn_data=txns)
         assert service.get_points_earned("u1") == 300
 
     def test_award_points_for_steps(self):
-        service = self._make_service()
+        service = _make_service()
         activity = {
             "activity_id": "a1",
             "activity_type": "steps",
@@ -416,7 +459,7 @@ class TestPointsService:
                 "created_at": now,
             },
         ]
-        service = self._make_service(txn_data=txns)
+        service = _make_service(txn_data=txns)
         activity = {
             "activity_id": "a2",
             "activity_type": "steps",
@@ -428,7 +471,7 @@ class TestPointsService:
         assert result["capped"] is True
 
     def test_award_points_zero_activity(self):
-        service = self._make_service()
+        service = _make_service()
         activity = {
             "activity_id": "a3",
             "activity_type": "steps",
@@ -437,25 +480,43 @@ class TestPointsService:
         result = service.award_points_for_activity("u1", activity)
         assert result["points_awarded"] == 0
 
-    def test_get_daily_context(self):
-        service = self._make_service()
-        ctx = service.get_daily_context("u1")
+    def test_get_daily_context(self, default_service):
+        ctx = default_service.get_daily_context("u1")
         assert "points_earned_today" in ctx
         assert "workouts_today" in ctx
         assert "steps_today" in ctx
 
-    def test_check_weekly_streak_no_activities(self):
-        service = self._make_service()
-        result = service.check_weekly_streak("u1")
+    def test_check_weekly_streak_no_activities(self, default_service):
+        result = default_service.check_weekly_streak("u1")
         assert "active_days" in result
         assert result["streak_complete"] is False
 
+    @pytest.mark.parametrize(
+        ("days_back", "complete"),
+        [(range(7), True), (range(6), False), (range(1, 8), False)],
+        ids=["full-week", "missing-oldest", "missing-today"],
+    )
+    def test_check_weekly_streak_counts_each_day(self, days_back, complete):
+        noon = datetime.now(tz=UTC).replace(hour=12, minute=0, second=0, microsecond=0)
+        activities = [
+            {
+                "user_id": "u1",
+                "activity_type": "workout",
+                "duration_minutes": 30,
+                "start_time": noon - timedelta(days=d),
+            }
+            for d in days_back
+        ]
+        result = _make_service(activity_data=activities).check_weekly_streak("u1")
+        assert result["streak_complete"] is complete
+        assert result["bonus_points"] == (250 if complete else 0)
+
     def test_transaction_history(self):
         txns = [
             {"user_id": "u1", "transaction_type": "earn", "amount": 100},
             {"user_id": "u1", "transaction_type": "spend", "amount": -50},
             {"user_id": "u2", "transaction_type": "earn", "amount": 200},
         ]
-        service = self._make_service(txn_data=txns)
+        service = _make_service(txn_data=txns)
         history = service.get_transaction_history("u1")
         assert len(history) == 2
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from hypothesis import given, settings
+from itertools import pairwise
+
+from hypothesis import given
 from hypothesis import strategies as st
 
 from fittrack.core.constants import (
@@ -19,6 +21,7 @@ from fittrack.services.points import (
     apply_daily_cap,
     calculate_active_minute_points,
     calculate_activity_points,
+    calculate_step_goal_bonus,
     calculate_step_points,
     calculate_weekly_streak_bonus,
     calculate_workout_bonus,
@@ -27,27 +30,20 @@ from fittrack.services.points import (
 # ── Step Points Properties ──────────────────────────────────────────
 
 
-@given(steps=st.integers(min_value=0, max_value=100_000))
-@settings(max_examples=200)
-def test_step_points_non_negative(steps: int):
-    """Step points are always >= 0."""
-    assert calculate_step_points(steps) >= 0
-
+def test_step_points_exhaustive():
+    """Over every step count 0–100K: non-negative, capped, and monotonic.
 
-@given(steps=st.integers(min_value=0, max_value=100_000))
-@settings(max_examples=200)
-def test_step_points_capped(steps: int):
-    """Step points never exceed the cap (20K steps * 10/1K = 200)."""
+    The domain is small enough to sweep outright, which is both faster and
+    stronger than sampling it — every 1K and cap boundary is hit exactly.
+    """
     max_points = (STEPS_DAILY_CAP // 1000) * POINTS_PER_1K_STEPS
-    assert calculate_step_points(steps) <= max_points
-
-
-@given(steps=st.integers(min_value=0, max_value=100_000))
-@settings(max_examples=200)
-def test_step_points_monotonic(steps: int):
-    """More steps never result in fewer points."""
-    if steps >= 1000:
-        assert calculate_step_points(steps) >= calculate_step_points(steps - 1000)
+    points = [calculate_step_points(steps) for steps in range(100_001)]
+    assert min(points) == 0
+    assert max(points) == max_points
+    assert all(a <= b for a, b in pairwise(points))
+    assert points == [
+        (min(steps, STEPS_DAILY_CAP) // 1000) * POINTS_PER_1K_STEPS for steps in range(100_001)
+    ]
 
 
 # ── Active Minute Properties ───────────────────────────────────────
@@ -57,31 +53,34 @@ def test_step_points_monotonic(steps: int):
     minutes=st.integers(min_value=0, max_value=1440),
     intensity=st.sampled_from(["light", "moderate", "vigorous"]),
 )
-@settings(max_examples=200)
 def test_active_minute_points_non_negative(minutes: int, intensity: str):
     assert calculate_active_minute_points(minutes, intensity) >= 0
 
 
-@given(minutes=st.integers(min_value=1, max_value=1440))
-@settings(max_examples=100)
-def test_vigorous_more_than_light(minutes: int):
+# Each example checks a whole batch of durations, so one draw covers many
+# points of the 1–1440 minute range.
+_minute_batches = st.lists(st.integers(min_value=1, max_value=1440), min_size=32, max_size=64)
+
+
+@given(minutes_list=_minute_batches)
+def test_vigorous_more_than_light(minutes_list: list[int]):
     """Vigorous intensity always earns more than light."""
-    light = calculate_active_minute_points(minutes, "light")
-    vigorous = calculate_active_minute_points(minutes, "vigorous")
-    assert vigorous > light
+    for minutes in minutes_list:
+        light = calculate_active_minute_points(minutes, "light")
+        assert calculate_active_minute_points(minutes, "vigorous") > light
 
 
-@given(minutes=st.integers(min_value=1, max_value=1440))
-@settings(max_examples=100)
-def test_intensity_ordering(minutes: int):
+@given(minutes_list=_minute_batches)
+def test_intensity_ordering(minutes_list: list[int]):
     """light < moderate < vigorous for same minutes."""
-    light = calculate_active_minute_points(minutes, "light")
-    moderate = calculate_active_minute_points(minutes, "moderate")
-    vigorous = calculate_active_minute_points(minutes, "vigorous")
-    assert light <= moderate <= vigorous
-    assert light == minutes * POINTS_ACTIVE_MINUTE_LIGHT
-    assert moderate == minutes * POINTS_ACTIVE_MINUTE_MODERATE
-    assert vigorous == minutes * POINTS_ACTIVE_MINUTE_VIGOROUS
+    for minutes in minutes_list:
+        light = calculate_active_minute_points(minutes, "light")
+        moderate = calculate_active_minute_points(minutes, "moderate")
+        vigorous = calculate_active_minute_points(minutes, "vigorous")
+        assert light <= moderate <= vigorous
+        assert light == minutes * POINTS_ACTIVE_MINUTE_LIGHT
+        assert moderate == minutes * POINTS_ACTIVE_MINUTE_MODERATE
+        assert vigorous == minutes * POINTS_ACTIVE_MINUTE_VIGOROUS
 
 
 # ── Workout Bonus Properties ───────────────────────────────────────
@@ -91,7 +90,6 @@ def test_intensity_ordering(minutes: int):
     duration=st.integers(min_value=0, max_value=300),
     workouts_today=st.integers(min_value=0, max_value=10),
 )
-@settings(max_examples=200)
 def test_workout_bonus_bounded(duration: int, workouts_today: int):
     """Workout bonus is either 0 or exactly POINTS_WORKOUT_BONUS."""
     bonus = calculate_workout_bonus(duration, workouts_today)
@@ -99,7 +97,6 @@ def test_workout_bonus_bounded(duration: int, workouts_today: int):
 
 
 @given(workouts_today=st.integers(min_value=WORKOUT_BONUS_DAILY_CAP, max_value=20))
-@settings(max_examples=50)
 def test_workout_cap_always_blocks(workouts_today: int):
     """Once at the daily workout cap, bonus is always 0."""
     assert calculate_workout_bonus(60, workouts_today) == 0
@@ -109,7 +106,6 @@ def test_workout_cap_always_blocks(workouts_today: int):
 
 
 @given(days=st.lists(st.booleans(), min_size=7, max_size=14))
-@settings(max_examples=200)
 def test_streak_bonus_binary(days: list[bool]):
     """Streak bonus is either 0 or 250."""
     bonus = calculate_weekly_streak_bonus(days)
@@ -117,7 +113,6 @@ def test_streak_bonus_binary(days: list[bool]):
 
 
 @given(extra=st.lists(st.booleans(), min_size=0, max_size=7))
-@settings(max_examples=50)
 def test_seven_true_always_gets_bonus(extra: list[bool]):
     """If the last 7 days are all active, bonus is awarded."""
     days = extra + [True] * 7
@@ -127,29 +122,23 @@ def test_seven_true_always_gets_bonus(extra: list[bool]):
 # ── Daily Cap Properties ───────────────────────────────────────────
 
 
-@given(
-    points=st.integers(min_value=0, max_value=5000),
-    already=st.integers(min_value=0, max_value=5000),
+_cap_inputs = st.lists(
+    st.tuples(st.integers(min_value=0, max_value=5000), st.integers(min_value=0, max_value=5000)),
+    min_size=64,
+    max_size=64,
 )
-@settings(max_examples=200)
-def test_daily_cap_never_exceeds_limit(points: int, already: int):
-    """After applying daily cap, total never exceeds DAILY_POINT_CAP."""
-    capped = apply_daily_cap(points, already)
-    assert already + capped <= max(already, DAILY_POINT_CAP)
 
 
-@given(
-    points=st.integers(min_value=0, max_value=5000),
-    already=st.integers(min_value=0, max_value=5000),
-)
-@settings(max_examples=200)
-def test_daily_cap_non_negative(points: int, already: int):
-    """Capped points are never negative."""
-    assert apply_daily_cap(points, already) >= 0
+@given(pairs=_cap_inputs)
+def test_daily_cap_bounds(pairs: list[tuple[int, int]]):
+    """Capped points are never negative and never push the day past the cap."""
+    for points, already in pairs:
+        capped = apply_daily_cap(points, already)
+        assert capped >= 0
+        assert already + capped <= max(already, DAILY_POINT_CAP)
 
 
 @given(points=st.integers(min_value=0, max_value=1000))
-@settings(max_examples=100)
 def test_daily_cap_identity_when_no_prior(points: int):
     """With nothing earned yet and points <= cap, full amount passes through."""
     assert apply_daily_cap(points, 0) == points
@@ -159,21 +148,24 @@ def test_daily_cap_identity_when_no_prior(points: int):
 
 
 @given(step_count=st.integers(min_value=0, max_value=50000))
-@settings(max_examples=100)
 def test_activity_points_steps_non_negative(step_count: int):
-    activity = {"activity_type": "steps", "metrics": {"step_count": step_count}}
-    assert calculate_activity_points(activity) >= 0
+    """A steps activity earns exactly the step points plus the goal bonus."""
+    points = calculate_activity_points(
+        {"activity_type": "steps", "metrics": {"step_count": step_count}}
+    )
+    assert points >= 0
+    assert points == calculate_step_points(step_count) + calculate_step_goal_bonus(step_count)
 
 
 @given(
     duration=st.integers(min_value=0, max_value=300),
     intensity=st.sampled_from(["light", "moderate", "vigorous"]),
 )
-@settings(max_examples=100)
 def test_activity_points_workout_non_negative(duration: int, intensity: str):
-    activity = {
-        "activity_type": "workout",
-        "duration_minutes": duration,
-        "intensity": intensity,
-    }
-    assert calculate_activity_points(activity) >= 0
+    """A workout earns its bonus plus active-minute points for its duration."""
+    activity = {"activity_type": "workout", "duration_minutes": duration, "intensity": intensity}
+    points = calculate_activity_points(activity)
+    assert points >= 0
+    assert points == calculate_workout_bonus(duration, 0) + calculate_active_minute_points(
+        duration, intensity
+    )
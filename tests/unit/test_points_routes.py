@@ -2,10 +2,22 @@
 
 from __future__ import annotations
 
+import pytest
 from fastapi.testclient import TestClient
 
 from tests.conftest import MockCursor, set_mock_query_result
 
+_USER_COLUMNS = ["user_id", "email", "role", "status", "point_balance"]
+
+
+@pytest.fixture
+def authed_user_cursor(mock_cursor: MockCursor) -> MockCursor:
+    """Cursor whose queries return the authenticated test user with no points."""
+    set_mock_query_result(
+        mock_cursor, _USER_COLUMNS, [("test-user", "user@example.com", "user", "active", 0)]
+    )
+    return mock_cursor
+
 
 class TestPointsBalance:
     def test_requires_auth(self, client: TestClient) -> None:
@@ -14,17 +26,16 @@ class TestPointsBalance:
 
     def test_get_balance(
         self,
-        client: TestClient,
+        user_client: TestClient,
         mock_cursor: MockCursor,
-        user_headers: dict[str, str],
     ) -> None:
-        # get_current_user query, then get_balance, then get_points_earned
+        # Auth is JWT-only; this row serves get_balance and get_points_earned
         set_mock_query_result(
             mock_cursor,
-            ["user_id", "email", "role", "status", "point_balance"],
+            _USER_COLUMNS,
             [("test-user", "user@example.com", "user", "active", 500)],
         )
-        resp = client.get("/api/v1/points/balance", headers=user_headers)
+        resp = user_client.get("/api/v1/points/balance")
         assert resp.status_code == 200
         data = resp.json()
         assert "user_id" in data
@@ -39,16 +50,10 @@ class TestPointsTransactions:
 
     def test_get_transactions(
         self,
-        client: TestClient,
-        mock_cursor: MockCursor,
-        user_headers: dict[str, str],
+        user_client: TestClient,
+        authed_user_cursor: MockCursor,
     ) -> None:
-        set_mock_query_result(
-            mock_cursor,
-            ["user_id", "email", "role", "status", "point_balance"],
-            [("test-user", "user@example.com", "user", "active", 0)],
-        )
-        resp = client.get("/api/v1/points/transactions", headers=user_headers)
+        resp = user_client.get("/api/v1/points/transactions")
         assert resp.status_code == 200
         data = resp.json()
         assert "items" in data
@@ -56,16 +61,10 @@ class TestPointsTransactions:
 
     def test_pagination(
         self,
-        client: TestClient,
-        mock_cursor: MockCursor,
-        user_headers: dict[str, str],
+        user_client: TestClient,
+        authed_user_cursor: MockCursor,
     ) -> None:
-        set_mock_query_result(
-            mock_cursor,
-            ["user_id", "email", "role", "status", "point_balance"],
-            [("test-user", "user@example.com", "user", "active", 0)],
-        )
-        resp = client.get("/api/v1/points/transactions?page=3&limit=5", headers=user_headers)
+        resp = user_client.get("/api/v1/points/transactions?page=3&limit=5")
         assert resp.status_code == 200
         data = resp.json()
         assert data["pagination"]["page"] == 3
@@ -79,16 +78,10 @@ class TestPointsDaily:
 
     def test_daily_status(
         self,
-        client: TestClient,
-        mock_cursor: MockCursor,
-        user_headers: dict[str, str],
+        user_client: TestClient,
+        authed_user_cursor: MockCursor,
     ) -> None:
-        set_mock_query_result(
-            mock_cursor,
-            ["user_id", "email", "role", "status", "point_balance"],
-            [("test-user", "user@example.com", "user", "active", 0)],
-        )
-        resp = client.get("/api/v1/points/daily", headers=user_headers)
+        resp = user_client.get("/api/v1/points/daily")
         assert resp.status_code == 200
         data = resp.json()
         assert "daily_cap" in data
@@ -104,14 +97,8 @@ class TestPointsStreak:
 
     def test_streak(
         self,
-        client: TestClient,
-        mock_cursor: MockCursor,
-        user_headers: dict[str, str],
+        user_client: TestClient,
+        authed_user_cursor: MockCursor,
     ) -> None:
-        set_mock_query_result(
-            mock_cursor,
-            ["user_id", "email", "role", "status", "point_balance"],
-            [("test-user", "user@example.com", "user", "active", 0)],
-        )
-        resp = client.get("/api/v1/points/streak", headers=user_headers)
+        resp = user_client.get("/api/v1/points/streak")
         assert resp.status_code == 200
@@ -4,19 +4,27 @@ from __future__ import annotations
 
 import logging
 import time
+from datetime import UTC, datetime
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+from freezegun import freeze_time
+
 from fittrack.api.middleware import (
     CSP_HEADER,
     HSTS_HEADER,
     RATE_LIMIT_WINDOW,
     SECURITY_HEADERS,
     _apply_rate_limit,
+    _blocked_until,
     _check_rate_limit,
+    _decode_token_cached,
     _get_client_key,
     _get_cors_origins,
+    _over_limit_until,
     _rate_buckets,
+    _token_cache,
+    _token_digest,
 )
 from fittrack.core.context import get_correlation_id, set_correlation_id
 from fittrack.core.logging import (
@@ -35,6 +43,8 @@ from fittrack.core.logging import (
 class TestRateLimiting:
     def setup_method(self) -> None:
         _rate_buckets.clear()
+        _over_limit_until.clear()
+        _token_cache.clear()
 
     def test_allows_first_request(self) -> None:
         allowed, remaining = _check_rate_limit("test:1", 10)
@@ -56,11 +66,37 @@ class TestRateLimiting:
 
     def test_expired_entries_pruned(self) -> None:
         key = "test:prune"
-        # Insert old timestamps
-        _rate_buckets[key] = [time.time() - RATE_LIMIT_WINDOW - 1] * 10
+        # A full bucket from two windows ago no longer counts
+        window = int(time.time() // RATE_LIMIT_WINDOW)
+        _rate_buckets[key] = (window - 2, 10, 10)
         allowed, _ = _check_rate_limit(key, 10)
         assert allowed is True
 
+    def test_idle_keys_evicted(self) -> None:
+        window = int(time.time() // RATE_LIMIT_WINDOW)
+        _rate_buckets["test:idle"] = (window - 2, 0, 5)
+        _rate_buckets["test:recent"] = (window - 1, 0, 5)
+        _check_rate_limit("test:live", 10)
+        assert list(_rate_buckets) == ["test:recent", "test:live"]
+
+    def test_key_count_capped_lru(self) -> None:
+        with patch("fittrack.api.middleware.RATE_LIMIT_MAX_KEYS", 3):
+            for key in ("test:a", "test:b", "test:c", "test:a", "test:d"):
+                _check_rate_limit(key, 10)
+        assert list(_rate_buckets) == ["test:c", "test:a", "test:d"]
+        assert _rate_buckets["test:a"][2] == 2
+
+    def test_previous_window_weighted_by_overlap(self) -> None:
+        key = "test:slide"
+        # Halfway through a window, a full previous window still counts for half
+        halfway = 1_000 * RATE_LIMIT_WINDOW + RATE_LIMIT_WINDOW / 2
+        _rate_buckets[key] = (999, 0, 10)
+        with freeze_time(datetime.fromtimestamp(halfway, tz=UTC)):
+            results = [_check_rate_limit(key, 10) for _ in range(6)]
+        assert results[0] == (True, 4)
+        assert results[4] == (True, 0)
+        assert results[5] == (False, 0)
+
     def test_client_key_from_forwarded(self) -> None:
         req = MagicMock()
         req.headers = {"x-forwarded-for": "1.2.3.4, 5.6.7.8"}
@@ -110,7 +146,6 @@ class TestRateLimiting:
         assert result is None
 
     def test_rate_limit_anonymous_tier(self) -> None:
-        _rate_buckets.clear()
         settings = MagicMock()
         settings.is_testing = False
         settings.rate_limit_anonymous = 2
@@ -125,7 +160,6 @@ class TestRateLimiting:
         assert result.status_code == 429
 
     def test_rate_limit_user_tier(self) -> None:
-        _rate_buckets.clear()
         settings = MagicMock()
         settings.is_testing = False
         settings.rate_limit_user = 2
@@ -141,8 +175,64 @@ class TestRateLimiting:
         assert result is not None
         assert result.status_code == 429
 
+    def test_over_limit_token_skips_decode(self) -> None:
+        settings = MagicMock()
+        settings.is_testing = False
+        settings.rate_limit_user = 1
+        req = MagicMock()
+        req.url.path = "/api/v1/test"
+        req.headers = {"authorization": "Bearer faketoken"}
+        req.client.host = "1.1.1.1"
+        with patch("fittrack.core.security.decode_token_safe") as mock_dec:
+            mock_dec.return_value = {"sub": "user1", "role": "user"}
+            results = [_apply_rate_limit(req, settings) for _ in range(4)]
+        assert results[0] is None
+        assert [r.status_code for r in results[1:]] == [429, 429, 429]
+        assert results[3].headers["X-RateLimit-Limit"] == "1"
+        assert mock_dec.call_count == 2
+        assert list(_over_limit_until) == [_token_digest("faketoken")]
+
+    def test_over_limit_entry_expires(self) -> None:
+        settings = MagicMock()
+        settings.is_testing = False
+        settings.rate_limit_anonymous = 2
+        req = MagicMock()
+        req.url.path = "/api/v1/test"
+        req.headers = {}
+        req.client.host = "2.2.2.2"
+        _over_limit_until["anon:2.2.2.2"] = (time.time() - 1, 2)
+        assert _apply_rate_limit(req, settings) is None
+        assert "anon:2.2.2.2" not in _over_limit_until
+
+    def test_blocked_until_tracks_sliding_estimate(self) -> None:
+        window = 1_000
+        _rate_buckets["test:full"] = (window, 0, 10)
+        _rate_buckets["test:carry"] = (window, 10, 5)
+        window_end = (window + 1) * RATE_LIMIT_WINDOW
+        # A full current window blocks until it rolls over
+        assert _blocked_until("test:full", 10) == window_end
+        # 10 * (1 - t) + 5 drops below 10 once half the window has passed
+        assert _blocked_until("test:carry", 10) == window_end - RATE_LIMIT_WINDOW / 2
+
+    def test_token_decode_cached_until_exp(self) -> None:
+        now = time.time()
+        payload = {"sub": "user1", "role": "user", "exp": now + 60}
+        with patch("fittrack.core.security.decode_token_safe", return_value=payload) as mock_dec:
+            first = _decode_token_cached("tok", _token_digest("tok"), now)
+            second = _decode_token_cached("tok", _token_digest("tok"), now + 30)
+            assert mock_dec.call_count == 1
+            _decode_token_cached("tok", _token_digest("tok"), now + 61)
+            assert mock_dec.call_count == 2
+        assert first is second is payload
+
+    def test_token_decode_failure_not_cached(self) -> None:
+        with patch("fittrack.core.security.decode_token_safe", return_value=None) as mock_dec:
+            assert _decode_token_cached("bad", _token_digest("bad"), time.time()) is None
+            assert _decode_token_cached("bad", _token_digest("bad"), time.time()) is None
+        assert mock_dec.call_count == 2
+        assert not _token_cache
+
     def test_rate_limit_admin_tier(self) -> None:
-        _rate_buckets.clear()
         settings = MagicMock()
         settings.is_testing = False
         settings.rate_limit_admin = 500
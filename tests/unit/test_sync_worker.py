@@ -263,6 +263,22 @@ class TestSyncConnection:
         assert result.duplicates_skipped == 1
         assert result.activities_stored == 0
 
+    def test_duplicate_within_one_fetch_skipped(self):
+        """An activity fetched twice in one batch is stored once."""
+        conn = _make_connection()
+        raws = [_make_raw_activity(external_id="ext_twice")] * 2
+        activity_repo = MockRepo()
+        worker = SyncWorker(
+            MockRepo([conn]),
+            activity_repo,
+            MockPointsService(),
+            providers={"google_fit": MockProvider(activities=raws)},
+        )
+        result = worker.sync_connection(conn)
+        assert result.activities_stored == 1
+        assert result.duplicates_skipped == 1
+        assert len(activity_repo._created) == 1
+
     def test_connection_updated_after_sync(self):
         conn = _make_connection()
         conn_repo = MockRepo([conn])
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 # ── Fake repos ──────────────────────────────────────────────────────
 
@@ -134,6 +134,31 @@ class TestE1LeaderboardWorker:
         # At least global tier processed (tier_code=None)
         assert result["tiers_processed"] >= 1
 
+    def test_leaderboard_caches_each_tier_in_one_batch(self) -> None:
+        """All periods of a tier are written with a single set_many call."""
+        from fittrack.services.cache import CacheService
+        from fittrack.services.leaderboard import VALID_PERIODS, LeaderboardService
+        from fittrack.workers.leaderboard_worker import LeaderboardWorker
+
+        lb_svc = LeaderboardService(
+            transaction_repo=FakeRepo(),
+            profile_repo=FakeRepo(),
+            activity_repo=FakeRepo(),
+            cache_service=None,
+        )
+        cache = CacheService()
+        worker = LeaderboardWorker(
+            leaderboard_service=lb_svc,
+            profile_repo=FakeRepo(),
+            cache_service=cache,
+        )
+        with patch.object(cache, "set_many", wraps=cache.set_many) as set_many:
+            worker.run()
+        set_many.assert_called_once()
+        assert set(set_many.call_args.args[0]) == {
+            f"leaderboard:{period}:global" for period in VALID_PERIODS
+        }
+
     def test_leaderboard_result_format(self) -> None:
         """LeaderboardWorkerResult.to_dict has expected keys."""
         from fittrack.workers.leaderboard_worker import LeaderboardWorkerResult